@@ -0,0 +1,273 @@
+"""
+Throughput and memory benchmarks for decoding and encoding models.
+
+Each benchmark builds a synthetic document of a particular shape, then measures:
+
+* ``decode``: ``import_data`` from xmltojson-style dictionaries
+* ``decode_xml``: ``from_xml`` from serialized bytes
+* ``encode``: ``to_primitive``
+* ``encode_xml``: ``to_xml``
+* ``round_trip``: ``from_xml`` followed by ``to_xml``
+
+Throughput is reported in elements per second, and for the operations which parse or
+write XML, in megabytes of XML per second, using the best of several repeats. Peak
+memory is measured with ``tracemalloc`` in a separate run.
+
+Usage::
+
+    python benchmarks/bench.py [--scale N] [--repeat N] [--only NAME ...]
+                               [--save BASELINE.json] [--compare BASELINE.json] [--tolerance 0.1]
+
+``--compare`` exits with status 1 if any throughput dropped, or peak memory grew,
+by more than the tolerance relative to the saved baseline.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from schematics_xmlelem.attributes import XmlAttribute  # noqa: E402
+from schematics_xmlelem.children import XmlChildren, XmlChildrenContent, XmlNestedChildList  # noqa: E402
+from schematics_xmlelem.content import XmlContent  # noqa: E402
+from schematics_xmlelem.model import XmlElementModel  # noqa: E402
+from schematics_xmlelem.types import XmlIntType, XmlStringType, XmlFloatType  # noqa: E402
+
+WIDE_ATTRIBUTES = 50
+DEEP_DEPTH = 6
+
+
+# Models
+
+Wide = type('Wide', (XmlElementModel,), dict(
+    [('attr_%d' % i, XmlAttribute(XmlIntType(), default=None)) for i in range(WIDE_ATTRIBUTES)]
+    + [('content', XmlContent(XmlStringType(), default=None))]
+))
+
+
+class WideList(XmlElementModel):
+    rows = XmlChildren(Wide)
+
+
+class Row(XmlElementModel):
+    id = XmlAttribute(XmlIntType())
+    value = XmlAttribute(XmlFloatType(), default=None)
+    content = XmlContent(XmlStringType(), default=None)
+
+
+class RowList(XmlElementModel):
+    rows = XmlChildren(Row)
+
+
+class ValueList(XmlElementModel):
+    values = XmlChildrenContent(XmlIntType())
+
+
+class Leaf(XmlElementModel):
+    id = XmlAttribute(XmlIntType())
+
+
+def _nested_levels(depth):
+    levels = [Leaf]
+    for i in range(depth):
+        levels.append(type('Level%d' % i, (XmlElementModel,), {
+            'id': XmlAttribute(XmlIntType()),
+            'items': XmlNestedChildList(levels[-1]),
+        }))
+    return levels
+
+
+# Level N holds a list of level N - 1 elements, down to Leaf at level 0
+LEVELS = _nested_levels(DEEP_DEPTH)
+
+
+class Message(XmlElementModel):
+    id = XmlAttribute(XmlIntType())
+
+
+class Ping(Message):
+    sequence = XmlAttribute(XmlIntType(), default=None)
+
+
+class Text(Message):
+    content = XmlContent(XmlStringType(), default=None)
+
+
+class Alert(Text):
+    level = XmlAttribute(XmlStringType(choices=['low', 'high']), default=None)
+
+
+class MessageList(XmlElementModel):
+    messages = XmlChildren(Message, allow_subclasses=True)
+
+
+class Document(XmlElementModel):
+    content = XmlContent(XmlStringType(), strip=False)
+
+
+# Document generators, each returning a model instance and its element count
+
+def wide(scale):
+    count = 20 * scale
+    rows = [Wide(content='row', **{'attr_%d' % i: n * i for i in range(WIDE_ATTRIBUTES)}) for n in range(count)]
+    return WideList(rows=rows), count + 1
+
+
+def long_list(scale):
+    count = 2000 * scale
+    return RowList(rows=[Row(id=i, value=i / 2, content='row %d' % i) for i in range(count)]), count + 1
+
+
+def long_content_list(scale):
+    count = 4000 * scale
+    return ValueList(values=list(range(count))), count + 1
+
+
+def deep(scale, depth=DEEP_DEPTH, fan_out=3):
+    levels = LEVELS
+    counter = [0]
+
+    def build(level):
+        counter[0] += 1
+        if level == 0:
+            return Leaf(id=counter[0])
+        counter[0] += 1  # Wrapper element of the nested list
+        return levels[level](id=counter[0], items=[build(level - 1) for _ in range(fan_out)])
+
+    root = build(depth)
+    for _ in range(scale - 1):
+        root = levels[depth](id=0, items=root.items + build(depth).items)
+    return root, counter[0]
+
+
+def polymorphic(scale):
+    count = 2000 * scale
+    kinds = [
+        lambda i: Ping(id=i, sequence=i),
+        lambda i: Text(id=i, content='text %d' % i),
+        lambda i: Alert(id=i, content='alert', level='high'),
+        lambda i: Message(id=i),
+    ]
+    return MessageList(messages=[kinds[i % len(kinds)](i) for i in range(count)]), count + 1
+
+
+def large_text(scale):
+    return Document(content='lorem ipsum dolor sit amet & <more> ' * (20000 * scale)), 1
+
+
+SHAPES = {
+    'wide': wide,
+    'long_list': long_list,
+    'long_content_list': long_content_list,
+    'deep': deep,
+    'polymorphic': polymorphic,
+    'large_text': large_text,
+}
+
+
+# Measurement
+
+def _operations(model):
+    # Each operation is paired with the number of bytes of XML it parses or writes
+    cls = type(model)
+    primitive = model.to_primitive()
+    xml = model.to_xml(encoding='utf-8')
+    return {
+        'decode': (lambda: cls(raw_value=primitive), None),
+        'decode_xml': (lambda: cls.from_xml(xml), len(xml)),
+        'encode': (lambda: model.to_primitive(), None),
+        'encode_xml': (lambda: model.to_xml(), len(xml)),
+        'round_trip': (lambda: cls.from_xml(xml).to_xml(), 2 * len(xml)),
+    }
+
+
+def _best_time(operation, repeat):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _peak_memory(operation):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(shapes, scale, repeat):
+    results = {}
+    for name in shapes:
+        model, elements = SHAPES[name](scale)
+        for operation_name, (operation, xml_bytes) in _operations(model).items():
+            seconds = _best_time(operation, repeat)
+            results['%s.%s' % (name, operation_name)] = {
+                'seconds': seconds,
+                'elements_per_second': elements / seconds,
+                'mb_per_second': None if xml_bytes is None else xml_bytes / seconds / 1e6,
+                'peak_bytes': _peak_memory(operation),
+            }
+    return results
+
+
+def report(results, baseline=None, tolerance=0.1):
+    regressions = []
+    header = '%-32s %14s %10s %12s' % ('benchmark', 'elements/s', 'MB/s', 'peak KiB')
+    if baseline is not None:
+        header += '  %9s %9s' % ('speed', 'memory')
+    print(header)
+    for key, result in results.items():
+        mb_per_second = result['mb_per_second']
+        line = '%-32s %14.0f %10s %12.0f' % (
+            key, result['elements_per_second'], '-' if mb_per_second is None else '%.2f' % mb_per_second,
+            result['peak_bytes'] / 1024
+        )
+        previous = (baseline or {}).get(key)
+        if previous is not None:
+            speed = result['elements_per_second'] / previous['elements_per_second']
+            memory = result['peak_bytes'] / max(previous['peak_bytes'], 1)
+            line += '  %8.2fx %8.2fx' % (speed, memory)
+            if speed < 1 - tolerance or memory > 1 + tolerance:
+                regressions.append(key)
+                line += '  REGRESSION'
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=int, default=1, help='Multiplier for document sizes')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark; the best is kept')
+    parser.add_argument('--only', nargs='+', choices=sorted(SHAPES), help='Document shapes to run')
+    parser.add_argument('--save', metavar='PATH', help='Write results to a JSON baseline file')
+    parser.add_argument('--compare', metavar='PATH', help='Compare results against a JSON baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Allowed relative regression')
+    args = parser.parse_args(argv)
+
+    results = run(args.only or list(SHAPES), args.scale, args.repeat)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+    regressions = report(results, baseline, args.tolerance)
+
+    if args.save:
+        with open(args.save, 'w') as fp:
+            json.dump(results, fp, indent=2, sort_keys=True)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
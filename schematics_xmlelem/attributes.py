@@ -1,6 +1,6 @@
 from typing import Optional
 
-from schematics_xmlelem.mixins import DefaultValueMixin, OverridableAttribNameMixin
+from schematics_xmlelem.mixins import DefaultValueMixin, OverridableAttribNameMixin, _overrides
 from schematics_xmlelem.types import XmlBaseType
 
 
@@ -8,6 +8,11 @@ class XmlAttributeBase(DefaultValueMixin, OverridableAttribNameMixin):
     def matches(self, field_name, attrib_name):
         return self._compare_name(field_name, attrib_name)
 
+    def _match_keys(self, field_name, match_result=True):
+        if _overrides(self, XmlAttributeBase, 'matches'):
+            return None
+        return super()._match_keys(field_name, match_result)
+
     def from_attr(self, field_name, value):
         raise NotImplementedError()
 
@@ -0,0 +1,418 @@
+"""Compact binary snapshots of decoded model trees"""
+import enum
+import gc
+import importlib
+import marshal
+import sys
+from array import array
+from functools import lru_cache
+from itertools import accumulate, repeat
+
+MAGIC = b'XEB2'
+
+# The marshal format may change between Python versions, so snapshots are only read
+# back by the same major and minor version which wrote them
+_HEADER = MAGIC + bytes(sys.version_info[:2])
+
+_SCALAR_TYPES = frozenset([str, int, float, bool, complex, type(None), bytes])
+_CONTAINER_TYPES = frozenset([list, tuple, set, frozenset, dict])
+
+# The most items which Python builds a dictionary display from in one step
+_MAX_DISPLAY_ITEMS = 16
+
+# Smallest first, so that integers are packed into the fewest bytes which hold them
+_INT_TYPECODES = [(code, array(code).itemsize * 8) for code in 'bBhHiIqQ']
+
+# Column kinds. Plain columns hold marshal-compatible values as they are, packed columns
+# hold integers or floats in an array shared with the rest of their table, reference
+# columns hold packed object indices (0 for None), and enum columns hold member names.
+# List columns pack the items of every row into one array, alongside an array of their
+# lengths (-1 for None).
+_PLAIN = 'P'
+_PACKED = 'A'
+_PACKED_LIST = 'N'
+_REF = 'R'
+_REF_LIST = 'L'
+_ENUM = 'E'
+_TAGGED = 'X'
+_EMPTY_LIST = 'empty'
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot is malformed or was written with different model definitions."""
+
+
+def _pack(values):
+    """Packs a list of ints or floats as ``(typecode, bytes)``, or returns ``None`` if it cannot."""
+    value_types = set(map(type, values))
+    if value_types == {float}:
+        packed = array('d', values)
+    elif value_types <= {int}:
+        low, high = (min(values), max(values)) if values else (0, 0)
+        for code, bits in _INT_TYPECODES:
+            if code.islower():
+                fits = -(1 << (bits - 1)) <= low and high < 1 << (bits - 1)
+            else:
+                fits = 0 <= low and high < 1 << bits
+            if fits:
+                packed = array(code, values)
+                break
+        else:
+            return None
+    else:
+        return None
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.typecode, packed.tobytes()
+
+
+def _unpack(typecode, data):
+    packed = array(typecode)
+    packed.frombytes(data)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tolist()
+
+
+def _pack_lists(lists):
+    """Packs lists of ints or floats, or ``None``, as an array of items and an array of lengths."""
+    items = _pack([item for value in lists if value is not None for item in value])
+    if items is None:
+        return None
+    return items + _pack([-1 if value is None else len(value) for value in lists])
+
+
+def _unpack_lists(items, lengths):
+    if len(lengths) == 1 and lengths[0] == len(items):
+        return [items]
+    ends = accumulate(length if length > 0 else 0 for length in lengths)
+    return [None if length < 0 else items[end - length:end] for end, length in zip(ends, lengths)]
+
+
+@lru_cache(maxsize=1024)
+def _row_builder(names):
+    """
+    Returns a function which takes one column per name and returns a data dictionary for
+    each row. The dictionary display is generated, as it is much faster than ``dict(zip())``.
+    Python builds displays of more than 16 items one item at a time, so wider rows are
+    instead assigned into copies of a dictionary which already holds every key.
+    """
+    variables = ['v%d' % i for i in range(len(names))]
+    if len(names) <= _MAX_DISPLAY_ITEMS:
+        source = 'def build(columns):\n    return [{%s} for %s, in zip(*columns)]\n' % (
+            ', '.join('%r: %s' % (name, variable) for name, variable in zip(names, variables)), ', '.join(variables)
+        )
+    else:
+        source = (
+            'def build(columns, copy=dict.fromkeys(%r).copy):\n'
+            '    rows = []\n'
+            '    for %s, in zip(*columns):\n'
+            '        row = copy()\n'
+            '%s'
+            '        rows.append(row)\n'
+            '    return rows\n'
+        ) % (names, ', '.join(variables), ''.join(
+            '        row[%r] = %s\n' % (name, variable) for name, variable in zip(names, variables)
+        ))
+    namespace = {}
+    exec(source, namespace)
+    return namespace['build']
+
+
+def _is_plain(value):
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES:
+        return True
+    if value_type is dict:
+        return all(_is_plain(k) and _is_plain(v) for k, v in value.items())
+    if value_type in _CONTAINER_TYPES:
+        return set(map(type, value)) <= _SCALAR_TYPES or all(_is_plain(item) for item in value)
+    return False
+
+
+class _Encoder(object):
+    """
+    Groups the models of a tree into tables of one class and one set of present fields,
+    then stores each field of a table as a single column.
+    """
+
+    def __init__(self, model_base, list_types):
+        self.model_base = model_base
+        self.list_types = list_types
+        self.classes = []
+        self.class_indices = {}
+        self.tables = {}
+        self.indices = {}
+
+    def class_index(self, cls):
+        index = self.class_indices.get(cls)
+        if index is None:
+            if '<locals>' in cls.__qualname__:
+                raise SnapshotError('%s cannot be referenced from a snapshot' % cls.__qualname__)
+            schema = getattr(cls, '_schema', None)
+            fingerprint = schema.fingerprint if schema is not None else b''
+            index = self.class_indices[cls] = len(self.classes)
+            self.classes.append((cls.__module__, cls.__qualname__, fingerprint))
+        return index
+
+    def collect(self, root):
+        stack = [root]
+        seen = set()
+        while stack:
+            model = stack.pop()
+            if id(model) in seen:
+                continue
+            seen.add(id(model))
+            schema = model._schema
+            if schema.lazy:
+                model._decode_deferred()
+            data = model._data
+            field_names = schema.field_names
+            if len(data) == len(field_names):
+                present = tuple(range(len(field_names)))
+            else:
+                present = tuple(i for i, field_name in enumerate(field_names) if field_name in data)
+            self.tables.setdefault((type(model), present), []).append(model)
+            for value in data.values():
+                if type(value) not in _SCALAR_TYPES:
+                    stack.extend(self.nested(value))
+
+    def nested(self, value):
+        if isinstance(value, self.model_base):
+            yield value
+        elif type(value) is dict:
+            for item in value.values():
+                yield from self.nested(item)
+        elif type(value) in _CONTAINER_TYPES or type(value) in self.list_types:
+            if not set(map(type, value)) <= _SCALAR_TYPES:
+                for item in value:
+                    yield from self.nested(item)
+
+    def encode(self, root):
+        self.collect(root)
+        index = 1
+        for models in self.tables.values():
+            for model in models:
+                self.indices[id(model)] = index
+                index += 1
+        tables = []
+        for (cls, present), models in self.tables.items():
+            field_names = cls._schema.field_names
+            columns = []
+            # Packed columns of one table with the same item type share a single array
+            arrays = {}
+            for i in present:
+                field_name = field_names[i]
+                column = self.column([model._data[field_name] for model in models])
+                if column[0] == _PACKED:
+                    chunks = arrays.setdefault(column[1], [])
+                    chunks.append(column[2])
+                    column = _PACKED, column[1], len(chunks) - 1
+                columns.append(column)
+            arrays = [(typecode, b''.join(chunks)) for typecode, chunks in arrays.items()]
+            tables.append((self.class_index(cls), present, len(models), columns, arrays))
+        return self.classes, tables, self.indices[id(root)]
+
+    def kind(self, value):
+        value_type = type(value)
+        if value is None:
+            return None
+        if value_type in _SCALAR_TYPES:
+            return _PLAIN
+        if isinstance(value, self.model_base):
+            return _REF
+        if isinstance(value, enum.Enum):
+            return _ENUM, value_type
+        if value_type in self.list_types:
+            if not value:
+                return _EMPTY_LIST
+            item_types = set(map(type, value))
+            if item_types == {int} or item_types == {float}:
+                return _PACKED_LIST
+            if item_types <= _SCALAR_TYPES:
+                return _PLAIN
+            item_types.discard(type(None))
+            if all(issubclass(item_type, self.model_base) for item_type in item_types):
+                return _REF_LIST
+            if _is_plain(value):
+                return _PLAIN
+            return _TAGGED
+        if _is_plain(value):
+            return _PLAIN
+        return _TAGGED
+
+    def column(self, values):
+        indices = self.indices
+        value_types = set(map(type, values))
+        if value_types <= _SCALAR_TYPES:
+            packed = _pack(values)
+            return (_PACKED,) + packed if packed is not None else (_PLAIN, values)
+        if all(value_type is type(None) or issubclass(value_type, self.model_base) for value_type in value_types):
+            return (_REF,) + _pack([0 if value is None else indices[id(value)] for value in values])
+        kinds = set(map(self.kind, values))
+        kinds.discard(None)
+        if len(kinds) > 1 and kinds - {_EMPTY_LIST} <= {_PLAIN, _PACKED_LIST, _REF_LIST}:
+            kinds.discard(_EMPTY_LIST)
+        if len(kinds) == 2 and kinds == {_PLAIN, _PACKED_LIST}:
+            kinds = {_PLAIN}
+        kind = kinds.pop() if len(kinds) == 1 else _TAGGED
+        if kind == _PACKED_LIST or kind == _EMPTY_LIST:
+            packed = _pack_lists(values)
+            if packed is not None:
+                return (_PACKED_LIST,) + packed
+            kind = _PLAIN
+        if kind == _PLAIN:
+            list_types = self.list_types
+            return _PLAIN, [list(value) if type(value) in list_types else value for value in values]
+        if kind == _REF:
+            return (_REF,) + _pack([0 if value is None else indices[id(value)] for value in values])
+        if kind == _REF_LIST:
+            return (_REF_LIST,) + _pack_lists([
+                None if value is None else [0 if item is None else indices[id(item)] for item in value]
+                for value in values
+            ])
+        if kind != _TAGGED:
+            return _ENUM, self.class_index(kind[1]), [None if value is None else value.name for value in values]
+        return _TAGGED, [self.tagged(value) for value in values]
+
+    def tagged(self, value):
+        """Encodes a value of any supported type, with containers marked by a tag."""
+        value_type = type(value)
+        if value_type in _SCALAR_TYPES:
+            return value
+        if isinstance(value, self.model_base):
+            return 'R', self.indices[id(value)]
+        if isinstance(value, enum.Enum):
+            return 'E', self.class_index(value_type), value.name
+        if value_type is dict:
+            return 'D', [(self.tagged(k), self.tagged(v)) for k, v in value.items()]
+        if value_type in self.list_types:
+            return 'L', [self.tagged(item) for item in value]
+        if value_type in _CONTAINER_TYPES:
+            return value_type.__name__[0].upper(), [self.tagged(item) for item in value]
+        raise SnapshotError('%s values cannot be stored in a snapshot' % value_type.__qualname__)
+
+
+def _resolve_class(module_name, qualname):
+    try:
+        target = importlib.import_module(module_name)
+        for part in qualname.split('.'):
+            target = getattr(target, part)
+    except (ImportError, AttributeError):
+        raise SnapshotError('Snapshot refers to unknown class %s.%s' % (module_name, qualname))
+    return target
+
+
+class _Decoder(object):
+    def __init__(self, classes, model_base):
+        self.classes = []
+        for module_name, qualname, fingerprint in classes:
+            cls = _resolve_class(module_name, qualname)
+            if not isinstance(cls, type) or not issubclass(cls, (model_base, enum.Enum)):
+                raise SnapshotError('Snapshot refers to %s.%s, which is not a model or enum' % (module_name, qualname))
+            schema = getattr(cls, '_schema', None)
+            if schema is not None and schema.fingerprint != fingerprint:
+                raise SnapshotError('Snapshot was written with a different definition of %s' % qualname)
+            self.classes.append(cls)
+        self.objects = [None]
+
+    def enum_member(self, enum_class, name):
+        try:
+            return enum_class[name]
+        except KeyError:
+            raise SnapshotError('Snapshot refers to unknown member %s of %s' % (name, enum_class.__qualname__))
+
+    def decode(self, tables, root):
+        # Create every instance first, so that columns can refer to any of them
+        objects = self.objects
+        instances = []
+        for class_index, _, count, _, _ in tables:
+            cls = self.classes[class_index]
+            created = list(map(cls.__new__, repeat(cls, count)))
+            instances.append(created)
+            objects.extend(created)
+        for (class_index, present, count, columns, arrays), created in zip(tables, instances):
+            field_names = self.classes[class_index]._schema.field_names
+            if columns:
+                arrays = {typecode: _unpack(typecode, data) for typecode, data in arrays}
+                data = _row_builder(tuple(field_names[i] for i in present))([
+                    arrays[column[1]][column[2] * count:(column[2] + 1) * count] if column[0] == _PACKED
+                    else self.column(column)
+                    for column in columns
+                ])
+            else:
+                data = [{} for _ in range(count)]
+            for _ in map(setattr, created, repeat('_data'), data):
+                pass
+        return objects[root]
+
+    def column(self, column):
+        kind = column[0]
+        if kind == _PLAIN:
+            return column[1]
+        if kind == _PACKED_LIST:
+            return _unpack_lists(_unpack(column[1], column[2]), _unpack(column[3], column[4]))
+        get = self.objects.__getitem__
+        if kind == _REF:
+            return list(map(get, _unpack(column[1], column[2])))
+        if kind == _REF_LIST:
+            return _unpack_lists(list(map(get, _unpack(column[1], column[2]))), _unpack(column[3], column[4]))
+        if kind == _ENUM:
+            enum_class = self.classes[column[1]]
+            return [None if name is None else self.enum_member(enum_class, name) for name in column[2]]
+        return list(map(self.tagged, column[1]))
+
+    def tagged(self, value):
+        if type(value) is not tuple:
+            return value
+        tag = value[0]
+        if tag == 'R':
+            return self.objects[value[1]]
+        if tag == 'E':
+            return self.enum_member(self.classes[value[1]], value[2])
+        if tag == 'D':
+            return {self.tagged(k): self.tagged(v) for k, v in value[1]}
+        items = map(self.tagged, value[1])
+        if tag == 'L':
+            return list(items)
+        if tag == 'T':
+            return tuple(items)
+        if tag == 'S':
+            return set(items)
+        if tag == 'F':
+            return frozenset(items)
+        raise SnapshotError('Corrupt model snapshot')
+
+
+def dumps(model):
+    """Encodes a model tree as bytes."""
+    from .model import XmlElementModel, _TrackedList
+
+    return _HEADER + marshal.dumps(_Encoder(XmlElementModel, (list, _TrackedList)).encode(model))
+
+
+def loads(data):
+    """
+    Decodes a model tree written by ``dumps``, with the same version of Python. Unlike
+    pickle, no code stored in the snapshot is run, but the modules defining the classes
+    it names are imported.
+    """
+    from .model import XmlElementModel
+
+    if data[:len(MAGIC)] != MAGIC:
+        raise SnapshotError('Not a model snapshot')
+    if data[:len(_HEADER)] != _HEADER:
+        raise SnapshotError('Snapshot was written by a different version of Python')
+    try:
+        classes, tables, root = marshal.loads(data[len(_HEADER):])
+    except (EOFError, ValueError, TypeError):
+        raise SnapshotError('Corrupt model snapshot')
+    decoder = _Decoder(classes, XmlElementModel)
+    # Every object created is reachable from the result, so collection passes would be wasted
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return decoder.decode(tables, root)
+    finally:
+        if enabled:
+            gc.enable()
@@ -1,12 +1,21 @@
 from typing import TYPE_CHECKING
 
-from schematics_xmlelem.mixins import DefaultValueMixin, ModelSpecMixin, OverridableTagNameMixin
+from schematics.undefined import Undefined
+
+from schematics_xmlelem.mixins import DefaultValueMixin, ModelSpecMixin, OverridableTagNameMixin, _overrides
 
 if TYPE_CHECKING:
     from schematics_xmlelem.types import XmlBaseType
     from schematics_xmlelem.mixins import ModelSpec
 
 
+def _begin_list(old_value):
+    # Copy so that a default or previously assigned list is never mutated
+    if old_value is Undefined:
+        return []
+    return list(old_value)
+
+
 class XmlChildBase(DefaultValueMixin):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -14,12 +23,58 @@ class XmlChildBase(DefaultValueMixin):
     def matches(self, field_name, elem):
         raise NotImplementedError()
 
+    def _match_keys(self, field_name):
+        """
+        Returns the ``(tag_name, case_sensitive, match_result)`` keys which ``matches`` would
+        accept, or ``None`` if this field can only be matched by calling ``matches``.
+        """
+        return None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Subclasses which customise ``incorporate_child`` but not ``accumulate_child`` must
+        # not inherit a builder that would bypass it. Builder methods they define themselves
+        # are kept.
+        if 'incorporate_child' in vars(cls) and 'accumulate_child' not in vars(cls):
+            cls.accumulate_child = XmlChildBase.accumulate_child
+            for name in ('begin_children', 'finish_children'):
+                if name not in vars(cls):
+                    setattr(cls, name, getattr(XmlChildBase, name))
+
     def incorporate_child(self, match_result, old_value, child):
         raise NotImplementedError()
 
+    def begin_children(self, old_value):
+        """
+        Starts accumulating the children matched by this field during a single import,
+        returning the initial builder state.
+        """
+        return old_value
+
+    def accumulate_child(self, state, match_result, child):
+        """
+        Adds a matched child to the builder state, returning the new state. Repeated fields
+        should update the state in place rather than copying it.
+        """
+        return self.incorporate_child(match_result, state, child)
+
+    def finish_children(self, state):
+        """
+        Converts the builder state into the field's value.
+        """
+        return state
+
     def to_children(self, field_name, value):
         raise NotImplementedError()
 
+    def write_children(self, field_name, value, writer):
+        """
+        Writes the elements for this field's value to an ``XmlWriter``. Equivalent to
+        writing each of the dictionaries returned by ``to_children``.
+        """
+        for child in self.to_children(field_name, value):
+            writer.write_primitive(child)
+
 
 class XmlChild(XmlChildBase, ModelSpecMixin):
     def __init__(self, candidates: 'ModelSpec', **kwargs):
@@ -28,6 +83,11 @@ class XmlChild(XmlChildBase, ModelSpecMixin):
     def matches(self, field_name, elem):
         return self._find_candidate(elem['tag'])
 
+    def _match_keys(self, field_name):
+        if _overrides(self, XmlChild, 'matches'):
+            return None
+        return self._candidate_match_keys()
+
     def incorporate_child(self, match_result, old_value, child):
         return match_result(raw_value=child)
 
@@ -37,6 +97,10 @@ class XmlChild(XmlChildBase, ModelSpecMixin):
         else:
             return [value.to_primitive()]
 
+    def write_children(self, field_name, value, writer):
+        if value is not None:
+            value.write_element(writer)
+
 
 class XmlChildren(XmlChildBase, ModelSpecMixin):
     def __init__(self, candidates: 'ModelSpec', **kwargs):
@@ -45,12 +109,28 @@ class XmlChildren(XmlChildBase, ModelSpecMixin):
     def matches(self, field_name, elem):
         return self._find_candidate(elem['tag'])
 
+    def _match_keys(self, field_name):
+        if _overrides(self, XmlChildren, 'matches'):
+            return None
+        return self._candidate_match_keys()
+
     def incorporate_child(self, match_result, old_value, child):
         return old_value + [match_result(raw_value=child)]
 
+    def begin_children(self, old_value):
+        return _begin_list(old_value)
+
+    def accumulate_child(self, state, match_result, child):
+        state.append(match_result(raw_value=child))
+        return state
+
     def to_children(self, field_name, value):
         return [child.to_primitive() for child in value]
 
+    def write_children(self, field_name, value, writer):
+        for child in value:
+            child.write_element(writer)
+
 
 class XmlChildContent(XmlChildBase, OverridableTagNameMixin):
     def __init__(self, type_: 'XmlBaseType', null_value=None, **kwargs):
@@ -61,6 +141,11 @@ class XmlChildContent(XmlChildBase, OverridableTagNameMixin):
     def matches(self, field_name, elem):
         return self._compare_name(field_name, elem['tag'])
 
+    def _match_keys(self, field_name):
+        if _overrides(self, XmlChildContent, 'matches'):
+            return None
+        return OverridableTagNameMixin._match_keys(self, field_name)
+
     def incorporate_child(self, match_result, old_value, child):
         if child['text'] is None:
             return self.null_value
@@ -87,6 +172,11 @@ class XmlBooleanChild(XmlChildBase, OverridableTagNameMixin):
     def matches(self, field_name, elem):
         return self._compare_name(field_name, elem['tag'])
 
+    def _match_keys(self, field_name):
+        if _overrides(self, XmlBooleanChild, 'matches'):
+            return None
+        return OverridableTagNameMixin._match_keys(self, field_name)
+
     def incorporate_child(self, match_result, old_value, child):
         return True
 
@@ -110,12 +200,27 @@ class XmlChildrenContent(XmlChildBase, OverridableTagNameMixin):
     def matches(self, field_name, elem):
         return self._compare_name(field_name, elem['tag'])
 
+    def _match_keys(self, field_name):
+        if _overrides(self, XmlChildrenContent, 'matches'):
+            return None
+        return OverridableTagNameMixin._match_keys(self, field_name)
+
     def incorporate_child(self, match_result, old_value, child):
         if child['text'] is None:
             return old_value + [None]
         else:
             return old_value + [self.type_.to_native(child['text'])]
 
+    def begin_children(self, old_value):
+        return _begin_list(old_value)
+
+    def accumulate_child(self, state, match_result, child):
+        if child['text'] is None:
+            state.append(None)
+        else:
+            state.append(self.type_.to_native(child['text']))
+        return state
+
     def to_children(self, field_name, value):
         tag = self._get_name(field_name)
         return [{
@@ -125,6 +230,12 @@ class XmlChildrenContent(XmlChildBase, OverridableTagNameMixin):
             'text': self.type_.to_primitive(child)
         } for child in value]
 
+    def write_children(self, field_name, value, writer):
+        tag = self._get_name(field_name)
+        for child in value:
+            writer.open(tag, None, self.type_.to_primitive(child))
+            writer.close()
+
 
 class XmlNestedChildList(XmlChildBase, OverridableTagNameMixin, ModelSpecMixin):
     def __init__(self, candidates: 'ModelSpec', **kwargs):
@@ -133,14 +244,23 @@ class XmlNestedChildList(XmlChildBase, OverridableTagNameMixin, ModelSpecMixin):
     def matches(self, field_name, elem):
         return self._compare_name(field_name, elem['tag'])
 
+    def _match_keys(self, field_name):
+        if _overrides(self, XmlNestedChildList, 'matches'):
+            return None
+        return OverridableTagNameMixin._match_keys(self, field_name)
+
     def incorporate_child(self, match_result, old_value, child):
-        grand_children = child.get('children', [])
-        result = []
-        for grand_child in grand_children:
+        return self.accumulate_child(_begin_list(old_value), match_result, child)
+
+    def begin_children(self, old_value):
+        return _begin_list(old_value)
+
+    def accumulate_child(self, state, match_result, child):
+        for grand_child in child.get('children', []):
             grand_child_match = self._find_candidate(grand_child['tag'])
             if grand_child_match is not None:
-                result.append(grand_child_match(raw_value=grand_child))
-        return old_value + result
+                state.append(grand_child_match(raw_value=grand_child))
+        return state
 
     def to_children(self, field_name, value):
         return [{
@@ -149,3 +269,9 @@ class XmlNestedChildList(XmlChildBase, OverridableTagNameMixin, ModelSpecMixin):
             'children': [child.to_primitive() for child in value],
             'text': None
         }]
+
+    def write_children(self, field_name, value, writer):
+        writer.open(self._get_name(field_name))
+        for child in value:
+            child.write_element(writer)
+        writer.close()
@@ -0,0 +1,187 @@
+"""Decoding of many records of one model type into per-field arrays"""
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
+
+from schematics.exceptions import DataError
+
+from .attributes import XmlAttribute, XmlBooleanAttribute
+from .children import XmlChildContent, XmlBooleanChild
+from .content import XmlContent
+from .etree import ElementView
+from .mixins import _overrides
+from .types import XmlIntType, XmlFloatType, XmlBoolType, XmlEnumType
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+Column = namedtuple('Column', ['values', 'mask', 'categories'])
+Column.__doc__ = """
+Decoded values of one field across a batch of records.
+
+``mask`` is true wherever the record had no value for the field. For enum fields,
+``values`` holds indices into ``categories``, or -1 where masked.
+"""
+
+_SCALAR_FIELDS = (XmlAttribute, XmlBooleanAttribute, XmlContent, XmlChildContent, XmlBooleanChild)
+
+_CHILD_METHODS = ('incorporate_child', 'begin_children', 'accumulate_child', 'finish_children')
+
+
+def _scalar_fields(schema, fields):
+    declared = OrderedDict()
+    declared.update(schema.attributes)
+    declared.update(schema.children)
+    declared.update(schema.content)
+    if fields is None:
+        return OrderedDict((k, v) for k, v in declared.items() if isinstance(v, _SCALAR_FIELDS))
+    result = OrderedDict()
+    for field_name in fields:
+        if field_name not in declared:
+            raise ValueError('%s has no field %r' % (schema.name, field_name))
+        if not isinstance(declared[field_name], _SCALAR_FIELDS):
+            raise ValueError('Field %r does not hold a single value per record' % field_name)
+        result[field_name] = declared[field_name]
+    return result
+
+
+def _collect(schema, records, columns, strict):
+    """Gathers the raw text for each column, indexed by record."""
+    content_fields = [k for k in schema.content if k in columns]
+    for i, record in enumerate(records):
+        if not isinstance(record, Mapping):
+            record = ElementView(record)
+        if not schema.compare_tag_name(record['tag']):
+            raise DataError({record['tag']: 'Mismatched tag name'})
+        for attrib_name, attrib_value in record.get('attrib', {}).items():
+            match = schema.match_attribute(attrib_name)
+            if match is None:
+                if strict:
+                    raise DataError({attrib_name: 'Rogue attribute'})
+            elif match[0] in columns:
+                columns[match[0]][i] = attrib_value
+        for child in record.get('children', []):
+            match = schema.match_child(child)
+            if match is None:
+                if strict:
+                    raise DataError({child['tag']: 'Rogue child'})
+            elif match[0] in columns:
+                columns[match[0]][i] = child
+        text = record.get('text')
+        if text is not None:
+            if content_fields:
+                columns[content_fields[0]][i] = text
+            elif strict and not schema.content:
+                raise DataError({'text': 'Rogue content'})
+
+
+def _customised(v):
+    """Returns whether a field subclass changes how values are imported."""
+    if isinstance(v, XmlAttribute):
+        return _overrides(v, XmlAttribute, 'from_attr')
+    if isinstance(v, XmlContent):
+        return _overrides(v, XmlContent, 'from_content')
+    for base in (XmlChildContent, XmlBooleanChild):
+        if isinstance(v, base):
+            return any(_overrides(v, base, name) for name in _CHILD_METHODS)
+    return False
+
+
+def _import_each(field_name, v, schema, raw, present):
+    """Converts one value at a time through the field's own import methods."""
+    if isinstance(v, (XmlAttribute, XmlBooleanAttribute)):
+        return [v.from_attr(field_name, raw[i]) for i in present]
+    if isinstance(v, XmlContent):
+        return [v.from_content(raw[i]) for i in present]
+    values = []
+    for i in present:
+        child = raw[i]
+        state = v.begin_children(v.from_default())
+        values.append(v.finish_children(v.accumulate_child(state, schema.match_child(child)[2], child)))
+    return values
+
+
+def _convert(field_name, v, schema, raw):
+    """Returns the positions holding a value and the native values at those positions."""
+    present = [i for i, value in enumerate(raw) if value is not None]
+    if _customised(v):
+        return present, _import_each(field_name, v, schema, raw, present)
+    if isinstance(v, XmlBooleanChild):
+        return present, [True] * len(present)
+    if isinstance(v, XmlBooleanAttribute):
+        return present, [v.from_attr(field_name, raw[i]) for i in present]
+    if isinstance(v, XmlContent):
+        values = [raw[i] for i in present]
+        if v.strip:
+            values = [value.strip() for value in values]
+        return present, v.type_.to_native_many(values)
+    if isinstance(v, XmlChildContent):
+        texts = [raw[i]['text'] for i in present]
+        converted = iter(v.type_.to_native_many([text for text in texts if text is not None]))
+        return present, [v.null_value if text is None else next(converted) for text in texts]
+    return present, v.type_.to_native_many([raw[i] for i in present])
+
+
+def _build_column(v, count, present, values):
+    mask = np.ones(count, dtype=bool)
+    # The values of customised fields may not be of their type's usual kind
+    type_ = None if _customised(v) else getattr(v, 'type_', None)
+    kept = [(i, value) for i, value in zip(present, values) if value is not None]
+    positions = [i for i, _ in kept]
+    natives = [value for _, value in kept]
+    categories = None
+    if isinstance(v, (XmlBooleanAttribute, XmlBooleanChild)) and not _customised(v):
+        array = np.zeros(count, dtype=bool)
+        mask[:] = False
+    elif isinstance(type_, XmlIntType):
+        array = np.zeros(count, dtype=np.int64)
+    elif isinstance(type_, XmlFloatType):
+        array = np.full(count, np.nan, dtype=np.float64)
+    elif isinstance(type_, XmlBoolType):
+        array = np.zeros(count, dtype=bool)
+    elif isinstance(type_, XmlEnumType):
+        categories = list(type_.enum_class)
+        codes = {variant: code for code, variant in enumerate(categories)}
+        array = np.full(count, -1, dtype=np.int32)
+        natives = [codes[value] for value in natives]
+    else:
+        array = np.empty(count, dtype=object)
+    if positions:
+        index = np.fromiter(positions, dtype=np.intp, count=len(positions))
+        if array.dtype == object:
+            # Assigned one by one so that sequence values are not broadcast
+            for i, value in zip(positions, natives):
+                array[i] = value
+        else:
+            array[index] = np.array(natives, dtype=array.dtype)
+        mask[index] = False
+    return Column(array, mask, categories)
+
+
+def decode_columns(model, records, fields=None, strict=False):
+    """
+    Decodes a batch of raw records of a single model type straight into columns,
+    without constructing any model instances.
+
+    ``records`` may contain xmltojson dictionaries or ElementTree/lxml elements.
+    Scalar fields (attributes, content, ``XmlChildContent`` and boolean children) are
+    supported, optionally restricted to ``fields``. Returns an ordered mapping from
+    field name to ``Column``; values are converted with each field's type in one batch
+    per column, including ``choices`` validation. Fields which customise their import
+    methods convert each value through them instead, into an object column. Requires numpy.
+    """
+    if np is None:
+        raise ImportError('decode_columns requires numpy')
+    schema = model._schema
+    if not isinstance(records, (list, tuple)):
+        records = list(records)
+    selected = _scalar_fields(schema, fields)
+    columns = OrderedDict((field_name, [None] * len(records)) for field_name in selected)
+    _collect(schema, records, columns, strict)
+    result = OrderedDict()
+    for field_name, v in selected.items():
+        present, values = _convert(field_name, v, schema, columns[field_name])
+        result[field_name] = _build_column(v, len(records), present, values)
+    return result
@@ -0,0 +1,326 @@
+"""Generates specialised ``import_data`` and ``to_primitive`` methods for model classes"""
+import linecache
+from itertools import count
+
+from schematics.exceptions import DataError
+from schematics.undefined import Undefined
+
+from . import profiling
+from .attributes import XmlAttribute, XmlBooleanAttribute
+from .children import XmlChild, XmlChildren, XmlChildContent, XmlBooleanChild, XmlChildrenContent, \
+    XmlNestedChildList, _begin_list
+from .content import XmlContent
+from .model import XmlElementModel, EMPTY_ATTRIB, EMPTY_CHILDREN, _inherited_method
+from .types import XmlStringType, XmlIntType, XmlFloatType
+
+_IMPORT_METHODS = ('import_data', '_import_element', '_import_attributes', '_import_children', '_import_content')
+_EXPORT_METHODS = ('to_primitive', '_to_primitive', '_export_attributes', '_export_children', '_export_content')
+
+_unique_ids = count()
+
+
+class _SourceWriter(object):
+    def __init__(self, namespace):
+        self.lines = []
+        self.depth = 0
+        self.namespace = namespace
+        self.constants = {}
+
+    def line(self, text):
+        self.lines.append('    ' * self.depth + text)
+
+    def indent(self):
+        self.depth += 1
+
+    def dedent(self):
+        self.depth -= 1
+
+    def const(self, prefix, value):
+        """Makes ``value`` available to the generated code, returning the name it is bound to."""
+        key = (prefix, id(value))
+        if key not in self.constants:
+            name = '%s_%d' % (prefix, len(self.constants))
+            self.namespace[name] = value
+            self.constants[key] = name
+        return self.constants[key]
+
+
+def _native_expr(w, type_, expr):
+    if type_.choices is None:
+        if type(type_) is XmlStringType:
+            return expr
+        if type(type_) is XmlIntType:
+            return 'int(%s)' % expr
+        if type(type_) is XmlFloatType:
+            return 'float(%s)' % expr
+    return '%s.to_native(%s)' % (w.const('t', type_), expr)
+
+
+def _primitive_expr(w, type_, expr):
+    if type(type_) is XmlStringType:
+        return expr
+    if type(type_) in (XmlIntType, XmlFloatType):
+        return 'str(%s)' % expr
+    return '%s.to_primitive(%s)' % (w.const('t', type_), expr)
+
+
+def _leaf_expr(name, text, shared=False):
+    if shared:
+        return "{'tag': %s, 'attrib': EMPTY_ATTRIB, 'children': EMPTY_CHILDREN, 'text': %s}" % (name, text)
+    return "{'tag': %s, 'attrib': {}, 'children': [], 'text': %s}" % (name, text)
+
+
+def _overridden(cls, names):
+    return any(_inherited_method(cls, name) is not getattr(XmlElementModel, name) for name in names)
+
+
+def _write_import(w, schema):
+    w.line('def import_data(self, raw_value, strict=False):')
+    w.indent()
+    w.line('if self._schema is not schema or profiling.active is not None:')
+    w.line('    return fallback_import_data(self, raw_value, strict)')
+    w.line("tag = raw_value['tag']")
+    if schema.tag_case_sensitive:
+        w.line('if tag != %r:' % schema.tag_name)
+    else:
+        w.line('if tag.lower() != %r:' % schema.tag_name.lower())
+    w.line("    raise DataError({tag: 'Mismatched tag name'})")
+    if schema.cache_exports:
+        w.line('self._invalidate_export()')
+    w.line('data = self._data')
+
+    # Attributes
+    if schema.attributes:
+        w.line("for attrib_name, attrib_value in raw_value.get('attrib', {}).items():")
+        w.indent()
+        w.line('match = match_attribute(attrib_name)')
+        w.line('if match is None:')
+        w.line('    if strict:')
+        w.line("        raise DataError({attrib_name: 'Rogue attribute'})")
+        w.line('    continue')
+        w.line('field_name = match[0]')
+        for i, (field_name, v) in enumerate(schema.attributes.items()):
+            w.line('%s field_name == %r:' % ('if' if i == 0 else 'elif', field_name))
+            w.indent()
+            if type(v) is XmlAttribute:
+                w.line('data[%r] = %s' % (field_name, _native_expr(w, v.type_, 'attrib_value')))
+            else:
+                w.line('data[%r] = %s.from_attr(%r, attrib_value)' % (field_name, w.const('f', v), field_name))
+            w.dedent()
+        w.dedent()
+    else:
+        w.line("if strict and raw_value.get('attrib'):")
+        w.line("    raise DataError({next(iter(raw_value['attrib'])): 'Rogue attribute'})")
+
+    # Children
+    builders = []
+    if schema.children:
+        for i, (field_name, v) in enumerate(schema.children.items()):
+            if type(v) in (XmlChildren, XmlChildrenContent, XmlNestedChildList):
+                builders.append(('b_%d' % i, field_name, None))
+                w.line('b_%d = None' % i)
+            elif type(v) not in (XmlChild, XmlChildContent, XmlBooleanChild):
+                builders.append(('s_%d' % i, field_name, v))
+                w.line('s_%d = _unset' % i)
+        w.line("for child in raw_value.get('children', []):")
+        w.indent()
+        w.line('match = match_child(child)')
+        w.line('if match is None:')
+        w.line('    if strict:')
+        w.line("        raise DataError({child['tag']: 'Rogue child'})")
+        w.line('    continue')
+        w.line('field_name = match[0]')
+        for i, (field_name, v) in enumerate(schema.children.items()):
+            w.line('%s field_name == %r:' % ('if' if i == 0 else 'elif', field_name))
+            w.indent()
+            kind = type(v)
+            if kind in (XmlChildren, XmlChildrenContent, XmlNestedChildList):
+                w.line('if b_%d is None:' % i)
+                w.line('    b_%d = _begin_list(data.get(%r, Undefined))' % (i, field_name))
+            if kind is XmlChild:
+                w.line('data[%r] = match[2](raw_value=child)' % field_name)
+            elif kind is XmlChildren:
+                w.line('b_%d.append(match[2](raw_value=child))' % i)
+            elif kind is XmlChildContent:
+                w.line("text = child['text']")
+                w.line('data[%r] = %s if text is None else %s' % (
+                    field_name, w.const('null', v.null_value), _native_expr(w, v.type_, 'text')
+                ))
+            elif kind is XmlBooleanChild:
+                w.line('data[%r] = True' % field_name)
+            elif kind is XmlChildrenContent:
+                w.line("text = child['text']")
+                w.line('b_%d.append(None if text is None else %s)' % (i, _native_expr(w, v.type_, 'text')))
+            elif kind is XmlNestedChildList:
+                w.line("for grand_child in child.get('children', []):")
+                w.line("    candidate = %s(grand_child['tag'])" % w.const('find', v._find_candidate))
+                w.line('    if candidate is not None:')
+                w.line('        b_%d.append(candidate(raw_value=grand_child))' % i)
+            else:
+                f = w.const('f', v)
+                w.line('if s_%d is _unset:' % i)
+                w.line('    s_%d = %s.begin_children(data.get(%r, Undefined))' % (i, f, field_name))
+                w.line('s_%d = %s.accumulate_child(s_%d, match[2], child)' % (i, f, i))
+            w.dedent()
+        w.dedent()
+        for var, field_name, v in builders:
+            if v is None:
+                w.line('if %s is not None:' % var)
+                w.line('    data[%r] = %s' % (field_name, var))
+            else:
+                w.line('if %s is not _unset:' % var)
+                w.line('    data[%r] = %s.finish_children(%s)' % (field_name, w.const('f', v), var))
+    else:
+        w.line("if strict and raw_value.get('children'):")
+        w.line("    raise DataError({raw_value['children'][0]['tag']: 'Rogue child'})")
+
+    # Content
+    w.line("text = raw_value.get('text')")
+    if schema.content:
+        field_name, v = next(iter(schema.content.items()))
+        w.line('if text is not None:')
+        if type(v) is XmlContent:
+            w.line('    data[%r] = %s' % (
+                field_name, _native_expr(w, v.type_, 'text.strip()' if v.strip else 'text')
+            ))
+        else:
+            w.line('    data[%r] = %s.from_content(text)' % (field_name, w.const('f', v)))
+    else:
+        w.line('if text is not None and strict:')
+        w.line("    raise DataError({'text': 'Rogue content'})")
+    if schema.auto_validate and schema.validation_plan:
+        w.line('self._check_validators()')
+    w.line('return self')
+    w.dedent()
+
+
+def _write_export(w, schema):
+    w.line('def to_primitive(self):')
+    w.indent()
+    w.line('if self._schema is not schema or profiling.active is not None:')
+    w.line('    return fallback_to_primitive(self)')
+    if schema.lazy:
+        w.line('self._decode_deferred()')
+    w.line('data = self._data')
+    shared = schema.intern_exports
+
+    w.line('attrib = {}')
+    for field_name, v in schema.attributes.items():
+        w.line('value = data.get(%r, Undefined)' % field_name)
+        if type(v) is XmlAttribute:
+            w.line('if value is not Undefined and value is not None:')
+            w.line('    attrib[%r] = %s' % (v._get_name(field_name), _primitive_expr(w, v.type_, 'value')))
+        elif type(v) is XmlBooleanAttribute:
+            name = v._get_name(field_name)
+            w.line('if value is not Undefined and value:')
+            w.line('    attrib[%r] = %r' % (name, name))
+        else:
+            w.line('if value is not Undefined:')
+            w.line('    attrib.update(%s.to_attr(%r, value))' % (w.const('f', v), field_name))
+
+    w.line('children = []')
+    for field_name, v in schema.children.items():
+        kind = type(v)
+        w.line('value = data.get(%r, Undefined)' % field_name)
+        if kind is XmlChild:
+            w.line('if value is not Undefined and value is not None:')
+            w.line('    children.append(value.to_primitive())')
+            continue
+        if kind is XmlBooleanChild:
+            w.line('if value is not Undefined and value:')
+            w.line('    children.append(%s)' % _leaf_expr(repr(v._get_name(field_name)), 'None', shared))
+            continue
+        w.line('if value is not Undefined:')
+        w.indent()
+        if kind is XmlChildren:
+            w.line('children.extend([child.to_primitive() for child in value])')
+        elif kind is XmlChildContent:
+            name = repr(v._get_name(field_name))
+            w.line('if %s == value:' % w.const('null', v.null_value))
+            w.line('    children.append(%s)' % _leaf_expr(name, 'None', shared))
+            w.line('elif value is not None:')
+            w.line('    children.append(%s)' % _leaf_expr(name, _primitive_expr(w, v.type_, 'value'), shared))
+        elif kind is XmlChildrenContent:
+            w.line('children.extend([%s for child in value])' % _leaf_expr(
+                repr(v._get_name(field_name)), _primitive_expr(w, v.type_, 'child'), shared
+            ))
+        elif kind is XmlNestedChildList and shared:
+            w.line("children.append({'tag': %r, 'attrib': EMPTY_ATTRIB, "
+                   "'children': [child.to_primitive() for child in value] or EMPTY_CHILDREN, "
+                   "'text': None})" % v._get_name(field_name))
+        elif kind is XmlNestedChildList:
+            w.line("children.append({'tag': %r, 'attrib': {}, 'children': [child.to_primitive() for child in value], "
+                   "'text': None})" % v._get_name(field_name))
+        else:
+            w.line('children.extend(%s.to_children(%r, value))' % (w.const('f', v), field_name))
+        w.dedent()
+
+    w.line('text = None')
+    for field_name, v in schema.content.items():
+        w.line('value = data.get(%r, Undefined)' % field_name)
+        w.line('if value is not Undefined:')
+        if type(v) is XmlContent:
+            w.line('    text = %s' % _primitive_expr(w, v.type_, 'value'))
+        else:
+            w.line('    text = %s.to_content(value)' % w.const('f', v))
+    if shared:
+        w.line("return {'tag': %r, 'attrib': attrib or EMPTY_ATTRIB, 'children': children or EMPTY_CHILDREN, "
+               "'text': text}" % schema.tag_name)
+    else:
+        w.line("return {'tag': %r, 'attrib': attrib, 'children': children, 'text': text}" % schema.tag_name)
+    w.dedent()
+
+
+def compile_model(cls):
+    """
+    Replaces the ``import_data`` and ``to_primitive`` methods of ``cls`` with versions
+    generated specifically for its schema. Built-in field and type classes are inlined,
+    while any other fields are called through their usual interface. While a profiler is
+    active the generic, instrumented methods are used instead.
+
+    The generated source is kept in ``cls._schema.compiled_source``. Methods which ``cls``
+    customises are left alone, and subclasses fall back to the methods ``cls`` would
+    otherwise have used unless compiled themselves. Returns ``cls``, so this may be used
+    as a class decorator.
+    """
+    schema = cls._schema
+    namespace = {
+        'schema': schema,
+        'profiling': profiling,
+        'DataError': DataError,
+        'Undefined': Undefined,
+        '_unset': object(),
+        '_begin_list': _begin_list,
+        'EMPTY_ATTRIB': EMPTY_ATTRIB,
+        'EMPTY_CHILDREN': EMPTY_CHILDREN,
+        'match_attribute': schema.match_attribute,
+        'match_child': schema.match_child,
+        'fallback_import_data': _inherited_method(cls, 'import_data'),
+        'fallback_to_primitive': _inherited_method(cls, 'to_primitive'),
+    }
+    w = _SourceWriter(namespace)
+    # Lazy models defer child decoding, which the generic import already handles
+    compile_import = not schema.lazy and not _overridden(cls, _IMPORT_METHODS)
+    # Cached exports are built by the generic method, which reuses unchanged subtrees
+    compile_export = not schema.cache_exports and not _overridden(cls, _EXPORT_METHODS)
+    if compile_import:
+        _write_import(w, schema)
+    if compile_export:
+        _write_export(w, schema)
+    if not w.lines:
+        return cls
+
+    source = '\n'.join(w.lines) + '\n'
+    filename = '<compiled %s.%s #%d>' % (cls.__module__, cls.__qualname__, next(_unique_ids))
+    exec(compile(source, filename, 'exec'), namespace)
+    # Allows tracebacks and debuggers to show the generated code
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+    if compile_import:
+        namespace['import_data']._compiled = True
+        cls.import_data = namespace['import_data']
+    if compile_export:
+        namespace['to_primitive']._compiled = True
+        cls.to_primitive = namespace['to_primitive']
+    schema.compiled_source = source
+    return cls
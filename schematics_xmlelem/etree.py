@@ -0,0 +1,91 @@
+"""Adapts ElementTree (and lxml) elements to the structure produced by xmltojson"""
+import mmap as _mmap
+from collections.abc import Mapping
+from xml.etree import ElementTree
+
+_KEYS = ('tag', 'attrib', 'children', 'text')
+
+
+class ElementView(Mapping):
+    """
+    Read-only view of an element which behaves like the ``{'tag', 'attrib', 'children', 'text'}``
+    dictionaries accepted by ``XmlElementModel.import_data``, without copying the tree.
+
+    Comments and processing instructions are not included in ``children``.
+    """
+    __slots__ = ('element',)
+
+    def __init__(self, element):
+        self.element = element
+
+    def __getitem__(self, key):
+        element = self.element
+        if key == 'tag':
+            return element.tag
+        elif key == 'attrib':
+            return element.attrib
+        elif key == 'children':
+            return [ElementView(child) for child in element if isinstance(child.tag, str)]
+        elif key == 'text':
+            return element.text
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(_KEYS)
+
+    def __len__(self):
+        return len(_KEYS)
+
+    def __repr__(self):
+        return 'ElementView(%r)' % self.element
+
+
+def parse_element(source):
+    """
+    Parses ``source``, which may be XML text, bytes or a readable file object,
+    returning its root element.
+    """
+    if hasattr(source, 'read'):
+        return ElementTree.parse(source).getroot()
+    return ElementTree.fromstring(source)
+
+
+def iter_file_chunks(path, mmap=True, chunk_size=1 << 20):
+    """
+    Yields the contents of the file at ``path`` in chunks of ``chunk_size`` bytes.
+
+    With ``mmap``, the file is memory-mapped and each chunk is a ``memoryview`` of the
+    mapping, so data is read straight from the page cache rather than copied by ``read``
+    calls. Chunks are released when the next one is requested, so must not be kept.
+    Files which cannot be mapped, such as empty files and pipes, are read normally.
+    """
+    with open(path, 'rb') as fp:
+        mapped = None
+        if mmap:
+            try:
+                mapped = _mmap.mmap(fp.fileno(), 0, access=_mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                pass
+        if mapped is None:
+            while True:
+                chunk = fp.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        with mapped, memoryview(mapped) as view:
+            if hasattr(mapped, 'madvise'):
+                mapped.madvise(_mmap.MADV_SEQUENTIAL)
+            for start in range(0, len(view), chunk_size):
+                with view[start:start + chunk_size] as chunk:
+                    yield chunk
+
+
+def parse_file(path, mmap=True, chunk_size=1 << 20):
+    """
+    Parses the file at ``path``, returning its root element. See ``iter_file_chunks``
+    for the meaning of the other arguments.
+    """
+    parser = ElementTree.XMLParser()
+    for chunk in iter_file_chunks(path, mmap, chunk_size):
+        parser.feed(chunk)
+    return parser.close()
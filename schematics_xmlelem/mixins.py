@@ -1,4 +1,5 @@
 import itertools
+import sys
 from typing import Union, TYPE_CHECKING, Iterable
 
 from schematics.undefined import Undefined
@@ -21,6 +22,11 @@ def _get_all_subclasses(cls):
     return all_subclasses
 
 
+def _overrides(obj, base, name):
+    """Returns whether ``obj``'s class replaces the ``name`` method defined by ``base``."""
+    return getattr(type(obj), name) is not getattr(base, name)
+
+
 class DefaultValueMixin:
     def __init__(self, default=Undefined, **kwargs):
         super().__init__(**kwargs)
@@ -38,6 +44,8 @@ class OverridableNameMixin:
         super().__init__(**kwargs)
         self.serialized_name = serialized_name
         self.case_sensitive = case_sensitive
+        # Converted names, interned so that every exported element shares the same string
+        self._names = {}
 
     def _convert_name(self, field_name):
         raise NotImplementedError()
@@ -45,8 +53,10 @@ class OverridableNameMixin:
     def _get_name(self, field_name):
         if self.serialized_name is not None:
             return self.serialized_name
-        else:
-            return self._convert_name(field_name)
+        name = self._names.get(field_name)
+        if name is None:
+            name = self._names[field_name] = sys.intern(self._convert_name(field_name))
+        return name
 
     def _compare_name(self, field_name, other_name):
         name = self._get_name(field_name)
@@ -55,6 +65,15 @@ class OverridableNameMixin:
             other_name = other_name.lower()
         return name == other_name
 
+    def _match_keys(self, field_name, match_result=True):
+        """
+        Returns the ``(name, case_sensitive, match_result)`` keys under which this field
+        can be looked up by name, or ``None`` if name comparison has been customised.
+        """
+        if _overrides(self, OverridableNameMixin, '_compare_name'):
+            return None
+        return [(self._get_name(field_name), self.case_sensitive, match_result)]
+
 
 class OverridableTagNameMixin(OverridableNameMixin):
     def _convert_name(self, field_name):
@@ -77,13 +96,25 @@ class ModelSpecMixin:
 
     def _get_all_candidates(self) -> Iterable['XmlElementModelMeta']:
         if self.allow_subclasses:
-            return itertools.chain.from_iterable(
-                ([m] + _get_all_subclasses(m) for m in self.candidates)
-            )
+            return itertools.chain.from_iterable(m._schema.subclasses for m in self.candidates)
         else:
             return self.candidates
 
+    def _candidate_match_keys(self):
+        if _overrides(self, ModelSpecMixin, '_find_candidate'):
+            return None
+        return [
+            (candidate._schema.tag_name, candidate._schema.tag_case_sensitive, candidate)
+            for candidate in self._get_all_candidates()
+        ]
+
     def _find_candidate(self, tag_name):
+        if self.allow_subclasses and not _overrides(self, ModelSpecMixin, '_get_all_candidates'):
+            for candidate in self.candidates:
+                subclass = candidate._schema.find_subclass(tag_name)
+                if subclass is not None:
+                    return subclass
+            return None
         for candidate in self._get_all_candidates():
             if candidate._schema.compare_tag_name(tag_name):
                 return candidate
@@ -1,16 +1,67 @@
-from collections import OrderedDict
-from copy import deepcopy
-from types import FunctionType
+import io
+import sys
+from collections import OrderedDict, defaultdict
+from collections.abc import Mapping, MutableMapping
+from time import perf_counter
+from types import FunctionType, MappingProxyType
+import weakref
 
-from schematics.exceptions import UndefinedValueError, DataError
+from schematics.exceptions import UndefinedValueError, DataError, BaseError, ConversionError
 from schematics.undefined import Undefined
 
+from . import profiling as _profiling
 from .attributes import XmlAttributeBase
-from .children import XmlChildBase
+from .children import XmlChildBase, XmlChildContent, XmlBooleanChild, XmlChildrenContent, XmlNestedChildList
 from .content import XmlContentBase
+from .etree import ElementView, parse_element, parse_file
+from .mixins import _overrides
+from .projection import Projection, freeze_spec
+from .selectors import Selector
+from .serializer import XmlWriter
 from .schema import Schema
 
 
+# Shared by every empty element exported from models with ``intern_exports``
+EMPTY_ATTRIB = MappingProxyType({})
+EMPTY_CHILDREN = ()
+
+# Fields whose exported elements are created by the field itself, and so may be modified
+# to share the empty containers. Other fields may return elements they keep references to.
+_SHARED_EMPTY_FIELDS = frozenset([XmlChildContent, XmlBooleanChild, XmlChildrenContent, XmlNestedChildList])
+
+
+def _share_empties(children):
+    for child in children:
+        if not child['attrib']:
+            child['attrib'] = EMPTY_ATTRIB
+        if not child['children']:
+            child['children'] = EMPTY_CHILDREN
+    return children
+
+
+class LazyValue(object):
+    """
+    Placeholder stored in a lazy model's data for a child field whose matched
+    elements have not been decoded yet.
+    """
+    __slots__ = ('field', 'old_value', 'matched')
+
+    def __init__(self, field, old_value, matched):
+        self.field = field
+        self.old_value = old_value
+        self.matched = matched
+
+    def decode(self):
+        old_value = self.old_value
+        if type(old_value) is LazyValue:
+            old_value = old_value.decode()
+        field = self.field
+        state = field.begin_children(old_value)
+        for match_result, child in self.matched:
+            state = field.accumulate_child(state, match_result, child)
+        return field.finish_children(state)
+
+
 class FieldDescriptor(object):
     """
     ``FieldDescriptor`` instances serve as field accessors on models.
@@ -37,8 +88,9 @@ class FieldDescriptor(object):
             value = instance._data.get(self.name, Undefined)
             if value is Undefined:
                 raise UndefinedValueError(instance, self.name)
-            else:
-                return value
+            elif type(value) is LazyValue:
+                value = instance._data[self.name] = value.decode()
+            return value
 
     def __set__(self, instance, value):
         """
@@ -53,6 +105,221 @@ class FieldDescriptor(object):
         del instance._data[self.name]
 
 
+class SlotFieldDescriptor(FieldDescriptor):
+    """
+    Field accessor for models using compact storage, which keeps the field's value
+    in a slot of the instance rather than in a ``_data`` dictionary.
+    """
+
+    def __init__(self, name, t, slot_name):
+        super().__init__(name, t)
+        self.slot_name = slot_name
+        self.slot = None
+
+    def __get__(self, instance, cls):
+        if instance is None:
+            return self.t
+        try:
+            value = self.slot.__get__(instance, cls)
+        except AttributeError:
+            value = Undefined
+        if value is Undefined:
+            raise UndefinedValueError(instance, self.name)
+        elif type(value) is LazyValue:
+            value = value.decode()
+            self.slot.__set__(instance, value)
+        return value
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance):
+        try:
+            self.slot.__delete__(instance)
+        except AttributeError:
+            raise KeyError(self.name)
+
+
+class _TrackedList(list):
+    """
+    List stored in a field of a model with ``cache_exports``, which discards the
+    model's cached export whenever it is modified in place.
+    """
+    __slots__ = ('_owner',)
+
+    def __init__(self, items, owner):
+        super().__init__(items)
+        self._owner = weakref.ref(owner)
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _invalidating(method):
+    def wrapper(self, *args, **kwargs):
+        owner = self._owner()
+        if owner is not None:
+            owner._invalidate_export()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+for _name in ('__setitem__', '__delitem__', '__iadd__', '__imul__', 'append', 'extend', 'insert', 'pop',
+              'remove', 'clear', 'sort', 'reverse'):
+    setattr(_TrackedList, _name, _invalidating(getattr(list, _name)))
+
+
+def _track_list(value, instance):
+    value_type = type(value)
+    if value_type is list or value_type is _TrackedList and value._owner() is not instance:
+        return _TrackedList(value, instance)
+    return value
+
+
+class _TrackingMixin(object):
+    """
+    Makes a field descriptor discard the model's cached export when the field is set or
+    deleted. Lists are replaced by tracked copies when first read or assigned.
+    """
+
+    def __get__(self, instance, cls):
+        value = super().__get__(instance, cls)
+        if instance is not None and type(value) is list:
+            value = _TrackedList(value, instance)
+            super().__set__(instance, value)
+        return value
+
+    def __set__(self, instance, value):
+        super().__set__(instance, _track_list(value, instance))
+        instance._invalidate_export()
+
+    def __delete__(self, instance):
+        super().__delete__(instance)
+        instance._invalidate_export()
+
+
+class TrackedFieldDescriptor(_TrackingMixin, FieldDescriptor):
+    pass
+
+
+class TrackedSlotFieldDescriptor(_TrackingMixin, SlotFieldDescriptor):
+    pass
+
+
+class SlotData(MutableMapping):
+    """
+    Dictionary-like view over the field slots of a compact model, standing in for
+    the ``_data`` dictionary of regular models.
+    """
+    __slots__ = ('instance', 'slots')
+
+    def __init__(self, instance):
+        self.instance = instance
+        self.slots = instance._schema.slots
+
+    def __getitem__(self, key):
+        try:
+            return self.slots[key].__get__(self.instance)
+        except AttributeError:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        slot = self.slots.get(key)
+        if slot is None:
+            return default
+        try:
+            return slot.__get__(self.instance)
+        except AttributeError:
+            return default
+
+    def __setitem__(self, key, value):
+        if key not in self.slots:
+            raise KeyError('%s has no field %r' % (type(self.instance).__name__, key))
+        self.slots[key].__set__(self.instance, value)
+
+    def __delitem__(self, key):
+        try:
+            self.slots[key].__delete__(self.instance)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __iter__(self):
+        instance = self.instance
+        return (key for key, slot in self.slots.items() if _has_slot(slot, instance))
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def _has_slot(slot, instance):
+    try:
+        slot.__get__(instance)
+    except AttributeError:
+        return False
+    return True
+
+
+def _set_slot_data(instance, value):
+    data = SlotData(instance)
+    data.clear()
+    data.update(value)
+
+
+def _inherited_slots(bases):
+    names = set()
+    for base in bases:
+        for klass in base.__mro__:
+            names.update(getattr(klass, '__slots__', ()))
+    return names
+
+
+# Number of model classes created and seconds spent creating them, per module
+_creation_stats = defaultdict(lambda: [0, 0.0])
+
+
+def class_creation_stats():
+    """
+    Returns ``{module: (classes, seconds)}`` describing the time spent creating
+    model classes in each module.
+    """
+    return {module: tuple(stats) for module, stats in _creation_stats.items()}
+
+
+def _compile_on_first_use(name):
+    def method(self, *args, **kwargs):
+        from .compiler import compile_model
+
+        cls = type(self)
+        compile_model(cls)
+        if vars(cls).get(name, method) is method:
+            # The compiler declined to replace this method, so use the one it would inherit
+            setattr(cls, name, _inherited_method(cls, name))
+        return getattr(cls, name)(self, *args, **kwargs)
+
+    method.__name__ = name
+    method._compile_stub = True
+    return method
+
+
+def _inherited_method(cls, name):
+    """
+    Returns the ``name`` method which ``cls`` would use without compilation, skipping
+    first-use stubs and generated methods. Generated methods only stand in for the
+    generic ones, as models with customised methods are never compiled.
+    """
+    for klass in cls.__mro__:
+        method = vars(klass).get(name)
+        if method is not None and not getattr(method, '_compile_stub', False) \
+                and not getattr(method, '_compiled', False):
+            return method
+    return getattr(XmlElementModel, name)
+
+
 class XmlElementModelMeta(type):
     """
     Metaclass for XML Models.
@@ -64,10 +331,17 @@ class XmlElementModelMeta(type):
         This metaclass parses the declarative Model into a corresponding Schema,
         then adding it as the `_schema` attribute to the host class.
         """
+        start = perf_counter()
 
         # Structures used to accumulate meta info
         tag_name = name
         tag_case_sensitive = True
+        compact = False
+        lazy = False
+        compiled = False
+        cache_exports = False
+        auto_validate = False
+        intern_exports = False
         attributes = OrderedDict()
         children = OrderedDict()
         content = OrderedDict()
@@ -76,10 +350,17 @@ class XmlElementModelMeta(type):
         # Accumulate metas info from parent classes
         for base in reversed(bases):
             if hasattr(base, '_schema'):
-                attributes.update(deepcopy(base._schema.attributes))
-                children.update(deepcopy(base._schema.children))
-                content.update(deepcopy(base._schema.content))
+                # Field specs hold no per-class state, so are shared rather than copied
+                attributes.update(base._schema.attributes)
+                children.update(base._schema.children)
+                content.update(base._schema.content)
                 validator_functions.update(base._schema.validators)
+                compact = compact or base._schema.compact
+                lazy = lazy or base._schema.lazy
+                compiled = compiled or base._schema.compiled
+                cache_exports = cache_exports or base._schema.cache_exports
+                auto_validate = auto_validate or base._schema.auto_validate
+                intern_exports = intern_exports or base._schema.intern_exports
 
         # Parse this class's attributes into schema structures
         for key, value in attrs.items():
@@ -92,75 +373,266 @@ class XmlElementModelMeta(type):
             elif isinstance(value, XmlContentBase):
                 content[key] = value
             elif key == 'tag_name':
-                tag_name = str(value)
+                tag_name = sys.intern(str(value))
             elif key == 'tag_case_sensitive':
                 tag_case_sensitive = bool(value)
+            elif key == 'compact':
+                if compact and not value:
+                    # Slot storage is inherited along with the descriptors, so cannot be undone
+                    raise TypeError('%s cannot set compact = False, as it inherits from a compact model' % name)
+                compact = bool(value)
+            elif key == 'lazy':
+                lazy = bool(value)
+            elif key == 'compiled':
+                compiled = bool(value)
+            elif key == 'cache_exports':
+                cache_exports = bool(value)
+            elif key == 'auto_validate':
+                auto_validate = bool(value)
+            elif key == 'intern_exports':
+                intern_exports = bool(value)
 
         # Convert declared fields into descriptors for new class
-        for key, t in attributes.items():
-            attrs[key] = FieldDescriptor(key, t)
-        for key, t in children.items():
-            attrs[key] = FieldDescriptor(key, t)
-        for key, t in content.items():
-            attrs[key] = FieldDescriptor(key, t)
+        descriptors = OrderedDict()
+        for fields in (attributes, children, content):
+            for key, t in fields.items():
+                if compact:
+                    descriptor_class = TrackedSlotFieldDescriptor if cache_exports else SlotFieldDescriptor
+                    descriptors[key] = descriptor_class(key, t, '_f_' + key)
+                else:
+                    descriptor_class = TrackedFieldDescriptor if cache_exports else FieldDescriptor
+                    descriptors[key] = descriptor_class(key, t)
+        attrs.update(descriptors)
+
+        if compact:
+            # Compact models store each field in its own slot, with no instance dictionary
+            inherited_slots = _inherited_slots(bases)
+            slots = list(attrs.get('__slots__', ()))
+            for descriptor in descriptors.values():
+                if descriptor.slot_name not in inherited_slots:
+                    slots.append(descriptor.slot_name)
+            if cache_exports:
+                slots.extend(name for name in ('_export_cache', '_export_parents') if name not in inherited_slots)
+            if not any(hasattr(base, '__weakref__') for base in bases):
+                slots.append('__weakref__')
+            attrs['__slots__'] = tuple(slots)
+            attrs['_data'] = property(SlotData, _set_slot_data)
+            attrs.setdefault('__reduce__', _reduce_compact)
 
         if len(content) > 1:
             raise AssertionError('Cannot have more than one content attribute')
 
+        if compiled:
+            # Generate specialised methods when the class is first used
+            for method_name in ('import_data', 'to_primitive'):
+                attrs.setdefault(method_name, _compile_on_first_use(method_name))
+
+        if '__module__' not in attrs:
+            # Created by calling the metaclass directly, so type.__new__ would attribute
+            # the class to this module rather than the caller's
+            attrs['__module__'] = sys._getframe(1).f_globals.get('__name__')
+
         klass = type.__new__(mcs, name, bases, attrs)
 
+        slots = None
+        if compact:
+            slots = OrderedDict()
+            for key, descriptor in descriptors.items():
+                descriptor.slot = getattr(klass, descriptor.slot_name)
+                slots[key] = descriptor.slot
+
         # Parse meta data into new schema
         klass._schema = Schema(
             name, tag_name=tag_name, tag_case_sensitive=tag_case_sensitive, model=klass,
-            validators=validator_functions, attributes=attributes, children=children, content=content
+            validators=validator_functions, attributes=attributes, children=children, content=content,
+            compact=compact, slots=slots, lazy=lazy, compiled=compiled, cache_exports=cache_exports,
+            auto_validate=auto_validate, intern_exports=intern_exports
         )
+        Schema.invalidate()
+
+        stats = _creation_stats[klass.__module__]
+        stats[0] += 1
+        stats[1] += perf_counter() - start
 
         return klass
 
 
+def _force_nested(value):
+    if isinstance(value, XmlElementModel):
+        value.force()
+    elif isinstance(value, list):
+        errors = {}
+        for i, item in enumerate(value):
+            if isinstance(item, XmlElementModel):
+                try:
+                    item.force()
+                except DataError as e:
+                    errors[i] = e.errors
+        if errors:
+            raise DataError(errors)
+
+
+def _detached_data(model):
+    """Returns a plain copy of a model's data, with deferred children decoded into the copy only."""
+    return {k: v.decode() if type(v) is LazyValue else v for k, v in model._data.items()}
+
+
+def _restore_model(cls, data):
+    instance = cls.__new__(cls)
+    instance._data = data
+    return instance
+
+
+def _reduce_compact(self):
+    # Compact models have no instance dictionary, so pickle as the class and field values
+    return _restore_model, (type(self), _detached_data(self))
+
+
 class XmlElementModel(object, metaclass=XmlElementModelMeta):
+    # Allows subclasses with ``compact = True`` to have no instance dictionary
+    __slots__ = ()
+
     def __init__(self, raw_value=None, **kwargs):
-        self._data = {}
-        for k, v in self._schema.attributes.items():
-            default = v.from_default()
-            if default is not Undefined:
-                self._data[k] = default
-        for k, v in self._schema.children.items():
-            default = v.from_default()
-            if default is not Undefined:
-                self._data[k] = default
-        for k, v in self._schema.content.items():
-            default = v.from_default()
-            if default is not Undefined:
-                self._data[k] = default
+        self._data = self._schema.new_data()
 
         if raw_value is not None:
             self.import_data(raw_value)
 
-        self._data.update(kwargs)
+        if kwargs:
+            self._data.update(kwargs)
+
+    def __getstate__(self):
+        # Cached exports refer to other models weakly, and deferred children may refer to
+        # parsed elements, so neither is carried over. The model itself is left unchanged.
+        state = dict(self.__dict__)
+        state.pop('_export_cache', None)
+        state.pop('_export_parents', None)
+        if self._schema.lazy:
+            state['_data'] = _detached_data(self)
+        return state
+
+    def dumps_binary(self):
+        """
+        Encodes this model and everything it contains as a compact binary snapshot.
+        Field values are stored in schema order, without their names. Raises
+        ``SnapshotError`` if a field holds a value of a type which cannot be stored.
+        """
+        from . import binary
+        return binary.dumps(self)
+
+    @classmethod
+    def loads_binary(cls, data):
+        """
+        Decodes a snapshot written by ``dumps_binary``. Raises ``SnapshotError`` if any model
+        class or enum member in it has been redefined since, if it was written by another
+        version of Python, or if the snapshot is not of a ``cls``.
+
+        Snapshots contain no pickled objects, but loading one imports the modules which
+        define the model and enum classes it names, so only load snapshots from a trusted
+        source.
+        """
+        from . import binary
+        model = binary.loads(data)
+        if not isinstance(model, cls):
+            raise binary.SnapshotError('Snapshot contains a %s, not a %s' % (type(model).__name__, cls.__name__))
+        return model
 
     def _import_attributes(self, attrib, strict=False):
+        profiler = _profiling.active
+        match_attribute = self._schema.match_attribute
+        data = self._data
         for attrib_name, attrib_value in attrib.items():
-            for field_name, v in self._schema.attributes.items():
-                if v.matches(field_name, attrib_name):
-                    self._data[field_name] = v.from_attr(field_name, attrib_value)
-                    break
-            else:
-                if strict:
-                    raise DataError({attrib_name: 'Rogue attribute'})
+            match = match_attribute(attrib_name)
+            if match is not None:
+                field_name, v, _ = match
+                if profiler is None:
+                    data[field_name] = v.from_attr(field_name, attrib_value)
+                else:
+                    start = perf_counter()
+                    data[field_name] = v.from_attr(field_name, attrib_value)
+                    profiler.record_field(self, field_name, perf_counter() - start)
+            elif strict:
+                raise DataError({attrib_name: 'Rogue attribute'})
+            elif profiler is not None:
+                profiler.record_rogue(self, 'attribute', attrib_name)
 
     def _import_children(self, children, strict=False):
+        profiler = _profiling.active
+        match_child = self._schema.match_child
+        data = self._data
+        builders = {}
         for child in children:
-            for field_name, v in self._schema.children.items():
-                match_result = v.matches(field_name, child)
-                if match_result:
-                    self._data[field_name] = v.incorporate_child(
-                        match_result, self._data.get(field_name, Undefined), child
-                    )
-                    break
-            else:
-                if strict:
-                    raise DataError({child['tag']: 'Rogue child'})
+            match = match_child(child)
+            if match is not None:
+                field_name, v, match_result = match
+                if profiler is not None:
+                    start = perf_counter()
+                if field_name in builders:
+                    state = builders[field_name]
+                else:
+                    state = v.begin_children(data.get(field_name, Undefined))
+                builders[field_name] = v.accumulate_child(state, match_result, child)
+                if profiler is not None:
+                    profiler.record_field(self, field_name, perf_counter() - start, calls=0)
+            elif strict:
+                raise DataError({child['tag']: 'Rogue child'})
+            elif profiler is not None:
+                profiler.record_rogue(self, 'child', child['tag'])
+        children_schema = self._schema.children
+        for field_name, state in builders.items():
+            data[field_name] = children_schema[field_name].finish_children(state)
+            if profiler is not None:
+                profiler.record_field(self, field_name, 0.0, elements=0)
+
+    def _defer_children(self, children, strict=False):
+        profiler = _profiling.active
+        match_child = self._schema.match_child
+        data = self._data
+        matched = {}
+        for child in children:
+            match = match_child(child)
+            if match is not None:
+                field_name, v, match_result = match
+                matched.setdefault(field_name, []).append((match_result, child))
+            elif strict:
+                raise DataError({child['tag']: 'Rogue child'})
+            elif profiler is not None:
+                profiler.record_rogue(self, 'child', child['tag'])
+        children_schema = self._schema.children
+        for field_name, field_matched in matched.items():
+            data[field_name] = LazyValue(children_schema[field_name], data.get(field_name, Undefined), field_matched)
+            if profiler is not None:
+                # Only counted here, as the time is spent later when the value is decoded
+                profiler.record_field(self, field_name, 0.0, elements=len(field_matched))
+
+    def _decode_deferred(self):
+        data = self._data
+        for field_name, value in list(data.items()):
+            if type(value) is LazyValue:
+                data[field_name] = value.decode()
+
+    def force(self):
+        """
+        Decodes any children whose decoding was deferred because the model is ``lazy``,
+        including those of nested models. Errors from every field are collected and
+        raised together as a ``DataError``.
+        """
+        errors = {}
+        data = self._data
+        for field_name, value in list(data.items()):
+            try:
+                if type(value) is LazyValue:
+                    value = data[field_name] = value.decode()
+                _force_nested(value)
+            except DataError as e:
+                errors[field_name] = e.errors
+            except BaseError as e:
+                errors[field_name] = e
+            except ValueError as e:
+                errors[field_name] = ConversionError(str(e))
+        if errors:
+            raise DataError(errors)
+        return self
 
     def _import_content(self, content, strict=False):
         if content is not None:
@@ -170,29 +642,161 @@ class XmlElementModel(object, metaclass=XmlElementModelMeta):
             else:
                 if strict:
                     raise DataError({'text': 'Rogue content'})
+                elif _profiling.active is not None:
+                    _profiling.active.record_rogue(self, 'content', 'text')
 
     def import_data(self, raw_value, strict=False):
+        if _profiling.active is not None:
+            return _profiling.active.import_data(self, raw_value, strict)
+        return self._import_element(raw_value, strict)
+
+    def _import_element(self, raw_value, strict):
+        if self._schema.cache_exports:
+            self._invalidate_export()
         if not self._schema.compare_tag_name(raw_value['tag']):
             raise DataError({raw_value['tag']: 'Mismatched tag name'})
         self._import_attributes(raw_value.get('attrib', {}), strict)
-        self._import_children(raw_value.get('children', []), strict)
+        if self._schema.lazy:
+            self._defer_children(raw_value.get('children', []), strict)
+        else:
+            self._import_children(raw_value.get('children', []), strict)
         self._import_content(raw_value.get('text'), strict)
+        if self._schema.auto_validate:
+            self._check_validators()
+        return self
+
+    def _check_validators(self):
+        from .validation import run_validators
+        errors = run_validators(self)
+        if errors:
+            raise DataError(errors)
+
+    def validate(self):
+        """
+        Runs the ``validate_<field>`` methods of this model and of every nested model,
+        decoding any deferred children first. Errors are collected and raised together
+        as a ``DataError``. Models with ``auto_validate`` run their own validators at the
+        end of ``import_data`` instead.
+        """
+        from .validation import validate_many
+        errors = validate_many([self])
+        if errors:
+            raise DataError(errors[0])
         return self
 
+    @classmethod
+    def from_raw_many(cls, raw_values, strict=False):
+        """
+        Decodes a sequence of xmltojson-style dictionaries, returning a list of models.
+        ``None`` items and existing instances of ``cls`` are passed through. Errors for
+        individual items are collected and raised together as a ``DataError`` keyed by index.
+        """
+        custom_init = cls.__init__ is not XmlElementModel.__init__
+        new_data = cls._schema.new_data
+        models = []
+        errors = {}
+        for i, raw_value in enumerate(raw_values):
+            if raw_value is None or isinstance(raw_value, cls):
+                models.append(raw_value)
+                continue
+            if custom_init:
+                model = cls()
+            else:
+                model = cls.__new__(cls)
+                model._data = new_data()
+            try:
+                model.import_data(raw_value, strict)
+            except BaseError as e:
+                errors[i] = e
+            except ValueError as e:
+                errors[i] = ConversionError(str(e))
+            models.append(model)
+        if errors:
+            raise DataError(errors)
+        return models
+
+    @classmethod
+    def projection(cls, only):
+        """
+        Returns a ``Projection`` which decodes only the fields of ``cls`` named by ``only``.
+        Projections are cached, so this may be called for each document.
+        """
+        if isinstance(only, Projection):
+            if only.model is not cls:
+                raise ValueError('Projection is for %s, not %s' % (only.model.__name__, cls.__name__))
+            return only
+        key = freeze_spec(only)
+        projection = cls._schema.projections.get(key)
+        if projection is None:
+            projection = cls._schema.projections[key] = Projection(cls, only)
+        return projection
+
+    @classmethod
+    def selector(cls, path):
+        """
+        Returns a ``Selector`` extracting the values at ``path`` from raw documents of ``cls``.
+        Selectors are cached, so this may be called for each document.
+        """
+        selector = cls._schema.selectors.get(path)
+        if selector is None:
+            selector = cls._schema.selectors[path] = Selector(cls, path)
+        return selector
+
+    @classmethod
+    def from_raw(cls, raw_value, strict=False, only=None):
+        """
+        Decodes an xmltojson-style dictionary or an element. If ``only`` is given, just
+        the fields it names are decoded, as described for ``Projection``.
+        """
+        if only is not None:
+            return cls.projection(only).decode(raw_value, strict)
+        if not isinstance(raw_value, Mapping):
+            raw_value = ElementView(raw_value)
+        return cls().import_data(raw_value, strict)
+
+    @classmethod
+    def from_element(cls, element, strict=False, only=None):
+        """
+        Decodes an ``xml.etree.ElementTree`` or lxml element directly, without first
+        converting it into dictionaries.
+        """
+        return cls.from_raw(ElementView(element), strict, only)
+
+    @classmethod
+    def from_xml(cls, source, strict=False, only=None):
+        """
+        Decodes XML text, bytes or a readable file object.
+        """
+        return cls.from_element(parse_element(source), strict, only)
+
+    @classmethod
+    def from_file(cls, path, strict=False, mmap=True, chunk_size=1 << 20, only=None):
+        """
+        Decodes the XML file at ``path``. With ``mmap``, the parser is fed directly from a
+        memory mapping of the file, ``chunk_size`` bytes at a time.
+        """
+        return cls.from_element(parse_file(path, mmap, chunk_size), strict, only)
+
     def _export_attributes(self):
         attrib = {}
+        data = self._data
         for field_name, v in self._schema.attributes.items():
-            value = self._data.get(field_name, Undefined)
+            value = data.get(field_name, Undefined)
             if value is not Undefined:
                 attrib.update(v.to_attr(field_name, value))
         return attrib
 
     def _export_children(self):
         children = []
+        data = self._data
+        shared = self._schema.intern_exports
         for field_name, v in self._schema.children.items():
-            value = self._data.get(field_name, Undefined)
+            value = data.get(field_name, Undefined)
             if value is not Undefined:
-                children.extend(v.to_children(field_name, value))
+                if shared and type(v) in _SHARED_EMPTY_FIELDS:
+                    children.extend(_share_empties(v.to_children(field_name, value)))
+                else:
+                    children.extend(v.to_children(field_name, value))
         return children
 
     def _export_content(self):
@@ -203,9 +807,104 @@ class XmlElementModel(object, metaclass=XmlElementModelMeta):
         return None
 
     def to_primitive(self):
-        return {
+        if _profiling.active is not None:
+            return _profiling.active.to_primitive(self)
+        if self._schema.cache_exports:
+            return self._cached_primitive()
+        return self._to_primitive()
+
+    def _cached_primitive(self):
+        """
+        Export used by models with ``cache_exports``. The result is kept until a field of
+        this model or of a nested model is changed, so unchanged subtrees are shared between
+        exports and must not be modified.
+        """
+        primitive = getattr(self, '_export_cache', None)
+        if primitive is not None:
+            return primitive
+        primitive = self._to_primitive()
+
+        # Only cache if every nested model's export was cached too, and so is tracked
+        cacheable = True
+        ref = weakref.ref(self)
+        data = self._data
+        for field_name, value in list(data.items()):
+            if type(value) is list:
+                value = data[field_name] = _TrackedList(value, self)
+            for item in value if isinstance(value, list) else (value,):
+                if isinstance(item, XmlElementModel):
+                    if getattr(item, '_export_cache', None) is None:
+                        cacheable = False
+                        continue
+                    parents = item._export_parents
+                    if ref not in parents:
+                        parents.append(ref)
+        if cacheable:
+            self._export_cache = primitive
+            self._export_parents = []
+        return primitive
+
+    def _invalidate_export(self):
+        """
+        Discards the cached export of this model and of every model whose cached export
+        includes it.
+        """
+        if getattr(self, '_export_cache', None) is None:
+            return
+        parents = self._export_parents
+        self._export_cache = None
+        self._export_parents = None
+        for ref in parents:
+            parent = ref()
+            if parent is not None:
+                parent._invalidate_export()
+
+    def _to_primitive(self):
+        if self._schema.lazy:
+            self._decode_deferred()
+        primitive = {
             'tag': self._schema.tag_name,
             'attrib': self._export_attributes(),
             'children': self._export_children(),
             'text': self._export_content(),
         }
+        if self._schema.intern_exports:
+            _share_empties((primitive,))
+        return primitive
+
+    def write_element(self, writer):
+        """
+        Writes this model as an element to an ``XmlWriter``.
+        """
+        if _inherited_method(type(self), 'to_primitive') is not XmlElementModel.to_primitive \
+                or _overrides(self, XmlElementModel, '_export_children'):
+            # Custom export logic can only be honoured through the dictionaries it produces
+            writer.write_primitive(self.to_primitive())
+            return
+        if self._schema.lazy:
+            self._decode_deferred()
+        writer.open(self._schema.tag_name, self._export_attributes(), self._export_content())
+        data = self._data
+        for field_name, v in self._schema.children.items():
+            value = data.get(field_name, Undefined)
+            if value is not Undefined:
+                v.write_children(field_name, value, writer)
+        writer.close()
+
+    def write_xml(self, fp, encoding=None, chunk_size=65536):
+        """
+        Writes this model as XML to the file-like object ``fp``, in chunks of roughly
+        ``chunk_size`` characters. The output is the same as passing ``self.to_primitive()``
+        to xmltojson's ``unparse``. If ``encoding`` is given, ``fp`` must accept bytes.
+        """
+        writer = XmlWriter(fp, encoding, chunk_size)
+        self.write_element(writer)
+        writer.flush()
+
+    def to_xml(self, encoding=None):
+        """
+        Returns this model as XML text, or as bytes if ``encoding`` is given.
+        """
+        fp = io.StringIO() if encoding is None else io.BytesIO()
+        self.write_xml(fp, encoding)
+        return fp.getvalue()
@@ -0,0 +1,98 @@
+"""Decoding of many independent documents across a pool of worker processes"""
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from schematics.exceptions import BaseError, DataError
+
+from .etree import parse_element
+from .streaming import _RecordSpec
+
+
+class DecodeFailure(object):
+    """
+    Stands in for the model of a document which could not be decoded by ``decode_many``.
+    """
+    __slots__ = ('index', 'error')
+
+    def __init__(self, index, error):
+        self.index = index
+        self.error = error
+
+    def __reduce__(self):
+        # schematics errors cannot be pickled directly, so send their primitive form
+        error = self.error
+        if isinstance(error, BaseError):
+            return _restore_failure, (self.index, type(error), error.to_primitive())
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(repr(error))
+        return _restore_failure, (self.index, None, error)
+
+    def __repr__(self):
+        return 'DecodeFailure(%r, %r)' % (self.index, self.error)
+
+
+def _restore_failure(index, error_type, payload):
+    if error_type is None:
+        error = payload
+    elif issubclass(error_type, DataError) or not isinstance(payload, list):
+        error = error_type(payload)
+    else:
+        error = error_type(*payload)
+    return DecodeFailure(index, error)
+
+
+def _decode_document(spec, source, strict):
+    if isinstance(source, os.PathLike):
+        with open(source, 'rb') as fp:
+            element = parse_element(fp)
+    else:
+        element = parse_element(source)
+    candidate = spec._find_candidate(element.tag)
+    if candidate is None:
+        raise DataError({element.tag: 'Mismatched tag name'})
+    return candidate.from_element(element, strict)
+
+
+def _decode_chunk(spec, strict, start, sources):
+    results = []
+    for offset, source in enumerate(sources):
+        try:
+            results.append(_decode_document(spec, source, strict))
+        except Exception as e:
+            results.append(DecodeFailure(start + offset, e))
+    return results
+
+
+def decode_many(model, sources, executor=None, chunksize=32, allow_subclasses=False, strict=False):
+    """
+    Parses and decodes many independent documents in parallel, returning the models
+    in the same order as ``sources``.
+
+    Each source may be XML text or bytes, or an ``os.PathLike`` naming a file. The model
+    class for each document is chosen from ``model`` by its root tag, in the same way as
+    for an ``XmlChildren`` field. Documents which fail to parse or decode are returned as
+    ``DecodeFailure`` objects rather than aborting the batch.
+
+    Documents are sent to ``executor`` in batches of ``chunksize``. If no executor is
+    given, a ``ProcessPoolExecutor`` is created for the call.
+    """
+    spec = _RecordSpec(model, allow_subclasses=allow_subclasses)
+    sources = list(sources)
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor()
+    try:
+        futures = [
+            executor.submit(_decode_chunk, spec, strict, start, sources[start:start + chunksize])
+            for start in range(0, len(sources), chunksize)
+        ]
+        results = []
+        for future in futures:
+            results.extend(future.result())
+        return results
+    finally:
+        if own_executor:
+            executor.shutdown()
@@ -0,0 +1,126 @@
+"""Opt-in instrumentation of model decoding and encoding"""
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+# The profiler currently recording, if any. Models check this once per call.
+active = None
+
+
+def _model_name(cls):
+    return '%s.%s' % (cls.__module__, cls.__qualname__)
+
+
+class _Timing(object):
+    __slots__ = ('calls', 'seconds', 'elements')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.elements = 0
+
+    def as_dict(self):
+        return {'calls': self.calls, 'seconds': self.seconds, 'elements': self.elements}
+
+
+class Profiler(object):
+    """
+    Records call counts, cumulative (inclusive) time and element counts for model imports
+    and exports, per model class and per field, along with the rogue attributes, children
+    and content ignored in non-strict mode.
+    """
+
+    def __init__(self):
+        self.imports = defaultdict(_Timing)
+        self.exports = defaultdict(_Timing)
+        self.fields = defaultdict(_Timing)
+        self.rogue = defaultdict(int)
+
+    def import_data(self, model, raw_value, strict):
+        timing = self.imports[type(model)]
+        start = perf_counter()
+        try:
+            return model._import_element(raw_value, strict)
+        finally:
+            timing.calls += 1
+            timing.elements += 1
+            timing.seconds += perf_counter() - start
+
+    def to_primitive(self, model):
+        timing = self.exports[type(model)]
+        start = perf_counter()
+        try:
+            if model._schema.cache_exports:
+                return model._cached_primitive()
+            return model._to_primitive()
+        finally:
+            timing.calls += 1
+            timing.elements += 1
+            timing.seconds += perf_counter() - start
+
+    def record_field(self, model, field_name, seconds, calls=1, elements=1):
+        """Called by models as they decode the attributes and children of a field."""
+        timing = self.fields[type(model), field_name]
+        timing.calls += calls
+        timing.elements += elements
+        timing.seconds += seconds
+
+    def record_rogue(self, model, kind, name):
+        """Called by models for each rogue ``attribute``, ``child`` or ``content`` ignored."""
+        self.rogue[type(model), kind, name] += 1
+
+    def as_dict(self):
+        result = {'models': {}, 'fields': {}, 'rogue': {}}
+        for direction, timings in (('import', self.imports), ('export', self.exports)):
+            for cls, timing in timings.items():
+                result['models'].setdefault(_model_name(cls), {})[direction] = timing.as_dict()
+        for (cls, field_name), timing in self.fields.items():
+            result['fields']['%s.%s' % (_model_name(cls), field_name)] = timing.as_dict()
+        for (cls, kind, name), count in self.rogue.items():
+            result['rogue'].setdefault(_model_name(cls), {})['%s:%s' % (kind, name)] = count
+        return result
+
+    def report(self):
+        """Returns a plain text summary, slowest entries first."""
+        lines = ['%-60s %10s %10s %12s' % ('model / field', 'calls', 'elements', 'seconds')]
+        rows = []
+        for direction, timings in (('import', self.imports), ('export', self.exports)):
+            for cls, timing in timings.items():
+                rows.append(('%s (%s)' % (_model_name(cls), direction), timing))
+        for (cls, field_name), timing in self.fields.items():
+            rows.append(('%s.%s' % (_model_name(cls), field_name), timing))
+        rows.sort(key=lambda row: row[1].seconds, reverse=True)
+        for name, timing in rows:
+            lines.append('%-60s %10d %10d %12.6f' % (name, timing.calls, timing.elements, timing.seconds))
+        if self.rogue:
+            lines.append('')
+            lines.append('%-60s %10s' % ('rogue', 'count'))
+            for (cls, kind, name), count in sorted(self.rogue.items(), key=lambda item: -item[1]):
+                lines.append('%-60s %10d' % ('%s %s %s' % (_model_name(cls), kind, name), count))
+        return '\n'.join(lines)
+
+
+def enable(profiler=None):
+    """Starts recording into ``profiler`` (or a new one) globally, returning it."""
+    global active
+    active = profiler if profiler is not None else Profiler()
+    return active
+
+
+def disable():
+    """Stops recording, returning the profiler that was active."""
+    global active
+    profiler, active = active, None
+    return profiler
+
+
+@contextmanager
+def profile(profiler=None):
+    """Records into ``profiler`` (or a new one) for the duration of the block."""
+    global active
+    previous = active
+    active = profiler if profiler is not None else Profiler()
+    try:
+        yield active
+    finally:
+        active = previous
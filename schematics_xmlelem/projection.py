@@ -0,0 +1,153 @@
+"""Decoding of a selected subset of a model's fields"""
+from collections.abc import Mapping
+
+from schematics.exceptions import DataError
+from schematics.undefined import Undefined
+
+from .children import XmlChild, XmlChildren, XmlNestedChildList
+from .etree import ElementView
+
+_NESTABLE_FIELDS = (XmlChild, XmlChildren, XmlNestedChildList)
+
+
+def _normalize(only):
+    """Converts a projection spec into ``{field_name: nested spec or None}``."""
+    if isinstance(only, str):
+        raise TypeError('Projection must be a collection of field names, not a string')
+    if isinstance(only, Mapping):
+        return {name: None if nested is None or nested is True else nested for name, nested in only.items()}
+    return {name: None for name in only}
+
+
+def freeze_spec(only):
+    """Returns a hashable equivalent of a projection spec, for use as a cache key."""
+    return frozenset(
+        (name, None if nested is None else freeze_spec(nested)) for name, nested in _normalize(only).items()
+    )
+
+
+class Projection(object):
+    """
+    Decodes only some of the fields of ``model``. ``only`` is a collection of field names,
+    or a mapping from field names to ``None`` (decode the whole field) or to a nested spec
+    of the same form. Nested specs apply to the models held by ``XmlChild``, ``XmlChildren``
+    and ``XmlNestedChildList`` fields, including any subclasses they accept, and need only
+    name fields which at least one of those models has.
+
+    Attributes, children and content outside the projection are skipped without being
+    converted, and the fields they belong to are left unset. A projection is checked
+    against the schema when created, and may be reused for any number of inputs.
+    """
+
+    def __init__(self, model, only, _ignore_missing=False):
+        self.model = model
+        schema = model._schema
+        spec = _normalize(only)
+        if not _ignore_missing:
+            for field_name in spec:
+                if field_name not in schema.field_names:
+                    raise ValueError('%s has no field %r' % (schema.name, field_name))
+
+        self.attributes = frozenset(name for name in schema.attributes if name in spec)
+        self.content = [(name, v) for name, v in schema.content.items() if name in spec]
+        self.children = {name: v for name, v in schema.children.items() if name in spec}
+        self.defaults = [
+            (name, v) for section in (schema.attributes, schema.children, schema.content)
+            for name, v in section.items() if name in spec
+        ]
+        self.nested = {}
+        self._nested_projections = {}
+        for field_name, v in self.children.items():
+            nested = spec[field_name]
+            if nested is None:
+                continue
+            if type(v) not in _NESTABLE_FIELDS:
+                raise ValueError('Field %r does not hold models, so cannot have a nested projection' % field_name)
+            self.nested[field_name] = nested
+            missing = set(_normalize(nested))
+            for candidate in v._get_all_candidates():
+                self._project(field_name, candidate)
+                missing.difference_update(candidate._schema.field_names)
+            if missing:
+                raise ValueError('No model in field %r has a field %r' % (field_name, sorted(missing)[0]))
+
+    def _project(self, field_name, model):
+        key = field_name, model
+        projection = self._nested_projections.get(key)
+        if projection is None:
+            projection = self._nested_projections[key] = Projection(model, self.nested[field_name], True)
+        return projection
+
+    def decode(self, raw_value, strict=False):
+        """
+        Decodes ``raw_value``, an xmltojson-style dictionary or an element, into a new
+        instance of the projection's model.
+        """
+        if not isinstance(raw_value, Mapping):
+            raw_value = ElementView(raw_value)
+        model = self.model
+        schema = model._schema
+        if not schema.compare_tag_name(raw_value['tag']):
+            raise DataError({raw_value['tag']: 'Mismatched tag name'})
+
+        data = {}
+        for field_name, v in self.defaults:
+            default = v.from_default()
+            if default is not Undefined:
+                data[field_name] = default
+
+        if self.attributes or strict:
+            for attrib_name, attrib_value in raw_value.get('attrib', {}).items():
+                match = schema.match_attribute(attrib_name)
+                if match is None:
+                    if strict:
+                        raise DataError({attrib_name: 'Rogue attribute'})
+                elif match[0] in self.attributes:
+                    data[match[0]] = match[1].from_attr(match[0], attrib_value)
+
+        if self.children or strict:
+            self._decode_children(data, raw_value.get('children', []), strict)
+
+        text = raw_value.get('text')
+        if text is not None:
+            if self.content:
+                field_name, v = self.content[0]
+                data[field_name] = v.from_content(text)
+            elif strict and not schema.content:
+                raise DataError({'text': 'Rogue content'})
+
+        instance = model.__new__(model)
+        instance._data = data
+        return instance
+
+    def _decode_children(self, data, children, strict):
+        match_child = self.model._schema.match_child
+        builders = {}
+        for child in children:
+            match = match_child(child)
+            if match is None:
+                if strict:
+                    raise DataError({child['tag']: 'Rogue child'})
+                continue
+            field_name, v, match_result = match
+            if field_name not in self.children:
+                continue
+            if field_name not in self.nested:
+                state = builders[field_name] if field_name in builders else v.begin_children(Undefined)
+                builders[field_name] = v.accumulate_child(state, match_result, child)
+            elif type(v) is XmlChild:
+                data[field_name] = self._project(field_name, match_result).decode(child, strict)
+            else:
+                state = builders.setdefault(field_name, [])
+                if type(v) is XmlChildren:
+                    state.append(self._project(field_name, match_result).decode(child, strict))
+                else:
+                    for grand_child in child.get('children', []):
+                        candidate = v._find_candidate(grand_child['tag'])
+                        if candidate is not None:
+                            state.append(self._project(field_name, candidate).decode(grand_child, strict))
+        for field_name, state in builders.items():
+            if field_name in self.nested:
+                data[field_name] = state
+            else:
+                data[field_name] = self.children[field_name].finish_children(state)
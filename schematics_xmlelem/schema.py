@@ -1,7 +1,50 @@
+import hashlib
+
+from schematics.undefined import Undefined
+from schematics.validate import prepare_validator
+
+from schematics_xmlelem.mixins import _get_all_subclasses, _overrides, DefaultValueMixin
+
+
+class NameIndex(object):
+    """
+    Maps serialized names to entries, honouring per-entry case sensitivity.
+
+    Entries are ranked so that a lookup returns the same entry as a linear scan
+    over the declared fields would have done. Fields which customise their
+    matching logic are kept aside as fallbacks and tested in rank order.
+    """
+
+    def __init__(self):
+        self.exact = {}
+        self.folded = {}
+        self.fallbacks = []
+
+    def add(self, name, case_sensitive, rank, entry):
+        if case_sensitive:
+            self.exact.setdefault(name, (rank, entry))
+        else:
+            self.folded.setdefault(name.lower(), (rank, entry))
+
+    def add_fallback(self, rank, entry):
+        self.fallbacks.append((rank, entry))
+
+    def lookup(self, name):
+        found = self.exact.get(name)
+        if self.folded:
+            folded = self.folded.get(name.lower())
+            if folded is not None and (found is None or folded[0] < found[0]):
+                found = folded
+        return found
+
 
 class Schema(object):
+    # Bumped whenever a model class is created, since ``allow_subclasses`` candidates may change
+    _generation = 0
 
-    def __init__(self, name, tag_name, tag_case_sensitive, model, validators, attributes, children, content):
+    def __init__(self, name, tag_name, tag_case_sensitive, model, validators, attributes, children, content,
+                 compact=False, slots=None, lazy=False, compiled=False, cache_exports=False,
+                 auto_validate=False, intern_exports=False):
         self.name = name
         self.tag_name = tag_name
         self.tag_case_sensitive = tag_case_sensitive
@@ -10,6 +53,26 @@ class Schema(object):
         self.attributes = attributes
         self.children = children
         self.content = content
+        self.compact = compact
+        self.slots = slots
+        self.lazy = lazy
+        self.compiled = compiled
+        self.cache_exports = cache_exports
+        self.auto_validate = auto_validate
+        self.intern_exports = intern_exports
+        self._validation_plan = None
+        self._default_plan = None
+        self.projections = {}
+        self.selectors = {}
+        self._field_names = None
+        self._fingerprint = None
+        self._attribute_index = None
+        self._child_index = None
+        self._child_index_generation = -1
+        self._subclasses = None
+        self._subclass_index = None
+        self._subclasses_generation = -1
+        self.compiled_source = None
 
     def compare_tag_name(self, other_name):
         tag_name = self.tag_name
@@ -17,3 +80,132 @@ class Schema(object):
             tag_name = tag_name.lower()
             other_name = other_name.lower()
         return tag_name == other_name
+
+    @property
+    def field_names(self):
+        """Names of all fields, in the order attributes, children, content."""
+        if self._field_names is None:
+            self._field_names = tuple(self.attributes) + tuple(self.children) + tuple(self.content)
+        return self._field_names
+
+    def new_data(self):
+        """Returns a new data dictionary holding the default value of each field."""
+        if self._default_plan is None:
+            static = {}
+            factories = []
+            for section in (self.attributes, self.children, self.content):
+                for field_name, v in section.items():
+                    if callable(v.default) or _overrides(v, DefaultValueMixin, 'from_default'):
+                        factories.append((field_name, v.from_default))
+                    elif v.default is not Undefined:
+                        static[field_name] = v.default
+            self._default_plan = static, tuple(factories)
+        static, factories = self._default_plan
+        data = dict(static)
+        for field_name, factory in factories:
+            value = factory()
+            if value is not Undefined:
+                data[field_name] = value
+        return data
+
+    @property
+    def fingerprint(self):
+        """Digest of the tag and field layout, used to detect stale serialized data."""
+        if self._fingerprint is None:
+            layout = [self.tag_name, self.tag_case_sensitive]
+            for section in (self.attributes, self.children, self.content):
+                for field_name, v in section.items():
+                    type_ = getattr(v, 'type_', None)
+                    layout.append((field_name, type(v).__qualname__, type(type_).__qualname__))
+            self._fingerprint = hashlib.sha1(repr(layout).encode('utf-8')).digest()[:8]
+        return self._fingerprint
+
+    @property
+    def validation_plan(self):
+        """
+        ``(field_name, validator)`` pairs in field order, where each validator is called as
+        ``validator(model, data, value, context)``.
+        """
+        if self._validation_plan is None:
+            self._validation_plan = tuple(
+                (field_name, prepare_validator(self.validators[field_name], 4))
+                for field_name in self.field_names if field_name in self.validators
+            )
+        return self._validation_plan
+
+    @staticmethod
+    def invalidate():
+        Schema._generation += 1
+
+    @staticmethod
+    def _build_index(fields):
+        index = NameIndex()
+        for rank, (field_name, v) in enumerate(fields.items()):
+            keys = v._match_keys(field_name)
+            if keys is None:
+                index.add_fallback((rank, 0), (field_name, v))
+            else:
+                for sub_rank, (name, case_sensitive, match_result) in enumerate(keys):
+                    index.add(name, case_sensitive, (rank, sub_rank), (field_name, v, match_result))
+        return index
+
+    @staticmethod
+    def _match(index, name, value):
+        found = index.lookup(name)
+        for rank, (field_name, v) in index.fallbacks:
+            if found is not None and found[0] < rank:
+                break
+            match_result = v.matches(field_name, value)
+            if match_result:
+                return field_name, v, match_result
+        return found[1] if found is not None else None
+
+    @property
+    def attribute_index(self):
+        if self._attribute_index is None:
+            self._attribute_index = self._build_index(self.attributes)
+        return self._attribute_index
+
+    @property
+    def child_index(self):
+        if self._child_index_generation != Schema._generation:
+            self._child_index = self._build_index(self.children)
+            self._child_index_generation = Schema._generation
+        return self._child_index
+
+    def _refresh_subclasses(self):
+        if self._subclasses_generation != Schema._generation:
+            self._subclasses = [self.model] + _get_all_subclasses(self.model)
+            index = NameIndex()
+            for rank, subclass in enumerate(self._subclasses):
+                index.add(subclass._schema.tag_name, subclass._schema.tag_case_sensitive, rank, subclass)
+            self._subclass_index = index
+            self._subclasses_generation = Schema._generation
+
+    @property
+    def subclasses(self):
+        """This schema's model followed by all of its subclasses, depth first."""
+        self._refresh_subclasses()
+        return self._subclasses
+
+    def find_subclass(self, tag_name):
+        """
+        Returns the first of ``subclasses`` whose tag name matches ``tag_name``, or ``None``.
+        """
+        self._refresh_subclasses()
+        found = self._subclass_index.lookup(tag_name)
+        return found[1] if found is not None else None
+
+    def match_attribute(self, attrib_name):
+        """
+        Returns ``(field_name, field, match_result)`` for the first declared attribute
+        matching ``attrib_name``, or ``None``.
+        """
+        return self._match(self.attribute_index, attrib_name, attrib_name)
+
+    def match_child(self, child):
+        """
+        Returns ``(field_name, field, match_result)`` for the first declared child
+        matching the ``child`` element, or ``None``.
+        """
+        return self._match(self.child_index, child['tag'], child)
@@ -1,12 +1,17 @@
 from typing import TYPE_CHECKING
-from schematics.types import BaseType
+from schematics.exceptions import CompoundError
+from schematics.transforms import import_converter
+from schematics.types import BaseType, ListType, DictType
+from schematics.types.base import PRIMITIVE
+from schematics.types.compound import NOT_NONE, DROP
 
 if TYPE_CHECKING:
     from schematics_xmlelem.model import XmlElementModelMeta
 
 
 class XmlModelType(BaseType):
-    def __init__(self, model: 'XmlElementModelMeta'):
+    def __init__(self, model: 'XmlElementModelMeta', **kwargs):
+        super().__init__(**kwargs)
         self.model = model
 
     def to_primitive(self, value, context=None):
@@ -18,4 +23,86 @@ class XmlModelType(BaseType):
         """
         Convert untrusted data to a richer Python construct.
         """
+        if isinstance(value, self.model):
+            return value
         return self.model(raw_value=value)
+
+    def to_native_many(self, values):
+        """
+        Converts a sequence of values, returning a list. ``None`` items are kept.
+        Errors are raised together as a ``DataError`` keyed by index.
+        """
+        return self.model.from_raw_many(values)
+
+    def to_primitive_many(self, values):
+        """Converts a sequence of models, returning a list. ``None`` items are kept."""
+        return [None if value is None else value.to_primitive() for value in values]
+
+
+def _batched(context, format=None):
+    # Other converters, such as validation, must still visit each item
+    if format is None:
+        return context.field_converter is import_converter
+    return format == PRIMITIVE
+
+
+class XmlModelListType(ListType):
+    """
+    ``ListType(XmlModelType(model))`` which converts and exports all of its items in
+    one call to the model, rather than going through schematics once per item.
+    """
+
+    def __init__(self, model: 'XmlElementModelMeta', **kwargs):
+        super().__init__(XmlModelType(model), **kwargs)
+
+    def _convert(self, value, context):
+        if not _batched(context):
+            return super()._convert(value, context)
+        value = self._coerce(value)
+        if self.field.required:
+            for item in value:
+                self.field.check_required(item, context)
+        return self.field.to_native_many(value)
+
+    def _export(self, list_instance, format, context):
+        if not _batched(context, format):
+            return super()._export(list_instance, format, context)
+        export_level = self.field.get_export_level(context)
+        if export_level == DROP:
+            return []
+        data = self.field.to_primitive_many(list_instance)
+        if export_level <= NOT_NONE:
+            data = [item for item in data if item is not None]
+        return data
+
+
+class XmlModelDictType(DictType):
+    """
+    ``DictType(XmlModelType(model))`` which converts and exports all of its values in
+    one call to the model, rather than going through schematics once per value.
+    """
+
+    def __init__(self, model: 'XmlElementModelMeta', **kwargs):
+        super().__init__(XmlModelType(model), **kwargs)
+
+    def _convert(self, value, context, safe=False):
+        if not _batched(context) or not isinstance(value, dict):
+            return super()._convert(value, context, safe)
+        keys = list(value)
+        try:
+            values = self.field.to_native_many(value.values())
+        except CompoundError as e:
+            raise CompoundError({keys[i]: error for i, error in e.errors.items()})
+        return {self.coerce_key(key): item for key, item in zip(keys, values)}
+
+    def _export(self, dict_instance, format, context):
+        if not _batched(context, format):
+            return super()._export(dict_instance, format, context)
+        export_level = self.field.get_export_level(context)
+        if export_level == DROP:
+            return {}
+        values = self.field.to_primitive_many(dict_instance.values())
+        return {
+            key: item for key, item in zip(dict_instance, values)
+            if item is not None or export_level > NOT_NONE
+        }
@@ -0,0 +1,143 @@
+"""Extraction of typed values from raw documents without decoding whole models"""
+import re
+from collections.abc import Mapping
+
+from schematics.undefined import Undefined
+
+from .children import XmlChild, XmlChildren, XmlNestedChildList
+from .etree import ElementView
+
+_STEP = re.compile(r'^([A-Za-z_][A-Za-z0-9_]*)(?:\[(\*|-?\d+)\])?$')
+
+
+def _parse_path(path):
+    steps = []
+    for part in path.split('.'):
+        match = _STEP.match(part)
+        if match is None:
+            raise ValueError('Invalid selector step %r in %r' % (part, path))
+        name, index = match.groups()
+        steps.append((name, None if index in (None, '*') else int(index)))
+    return steps
+
+
+def _field(schema, field_name):
+    for section in (schema.attributes, schema.children, schema.content):
+        if field_name in section:
+            return section, section[field_name]
+    return None, None
+
+
+class Selector(object):
+    """
+    Extracts the values of a field from raw documents of ``model``, without decoding
+    anything else. ``path`` is a ``.``-separated sequence of field names, optionally
+    starting with the name of ``model`` itself, such as ``'Foo2.bars[*].field1'``. Every
+    step but the last must name a field holding models. A step may be followed by
+    ``[n]`` to take only the ``n``-th item of its value within each parent, or ``[*]``,
+    which is the same as no index, to take all of them.
+
+    Elements are matched to fields exactly as ``import_data`` would, and values are
+    converted by their fields. Fields which are absent from a document contribute no
+    values, whatever their defaults. The path is checked against the schema when the
+    selector is created, and it may then be used on any number of documents.
+    """
+
+    def __init__(self, model, path):
+        self.model = model
+        self.path = path
+        steps = _parse_path(path)
+        schema = model._schema
+        if steps[0][0] == schema.name and steps[0][0] not in schema.field_names:
+            if steps[0][1] is not None:
+                raise ValueError('The model step of %r cannot be indexed' % path)
+            steps = steps[1:]
+        if not steps:
+            raise ValueError('Selector %r names no field' % path)
+        self.steps = steps
+
+        models = [model]
+        for i, (field_name, _) in enumerate(steps):
+            fields = [(m, m._schema.children.get(field_name)) for m in models if field_name in m._schema.field_names]
+            if not fields:
+                raise ValueError('No model at step %d of %r has a field %r' % (i + 1, path, field_name))
+            if i == len(steps) - 1:
+                break
+            models = []
+            for m, v in fields:
+                if not isinstance(v, (XmlChild, XmlChildren, XmlNestedChildList)):
+                    raise ValueError('Field %r of %s does not hold models' % (field_name, m.__name__))
+                models.extend(candidate for candidate in v._get_all_candidates() if candidate not in models)
+
+    def _items(self, element, model, field_name, terminal):
+        schema = model._schema
+        section, v = _field(schema, field_name)
+        if v is None:
+            return []
+
+        if section is schema.attributes:
+            # Several names can match the same field, in which case the last wins, as on import
+            found = Undefined
+            for attrib_name, attrib_value in element.get('attrib', {}).items():
+                match = schema.match_attribute(attrib_name)
+                if match is not None and match[0] == field_name:
+                    found = attrib_value
+            return [] if found is Undefined else [v.from_attr(field_name, found)]
+
+        if section is schema.content:
+            text = element.get('text')
+            return [] if text is None else [v.from_content(text)]
+
+        match_child = schema.match_child
+        matched = []
+        for child in element.get('children', []):
+            match = match_child(child)
+            if match is not None and match[0] == field_name:
+                matched.append((match[2], child))
+        if not matched:
+            return []
+
+        if terminal:
+            state = v.begin_children(Undefined)
+            for match_result, child in matched:
+                state = v.accumulate_child(state, match_result, child)
+            value = v.finish_children(state)
+            return value if isinstance(value, list) else [value]
+
+        if isinstance(v, XmlNestedChildList):
+            items = []
+            for _, child in matched:
+                for grand_child in child.get('children', []):
+                    candidate = v._find_candidate(grand_child['tag'])
+                    if candidate is not None:
+                        items.append((grand_child, candidate))
+            return items
+        return [(child, candidate) for candidate, child in matched]
+
+    def select(self, raw_value):
+        """
+        Returns a list of the selected values in ``raw_value``, an xmltojson-style dictionary
+        or an element. Documents whose root does not match the model select nothing.
+        """
+        if not isinstance(raw_value, Mapping):
+            raw_value = ElementView(raw_value)
+        if not self.model._schema.compare_tag_name(raw_value['tag']):
+            return []
+
+        frontier = [(raw_value, self.model)]
+        last = len(self.steps) - 1
+        for i, (field_name, index) in enumerate(self.steps):
+            selected = []
+            for element, model in frontier:
+                items = self._items(element, model, field_name, i == last)
+                if index is None:
+                    selected.extend(items)
+                elif -len(items) <= index < len(items):
+                    selected.append(items[index])
+            frontier = selected
+        return frontier
+
+    def first(self, raw_value, default=None):
+        """Returns the first value selected in ``raw_value``, or ``default``."""
+        values = self.select(raw_value)
+        return values[0] if values else default
@@ -0,0 +1,62 @@
+"""Writes XML text directly from models, without building intermediate dictionaries"""
+from xml.sax.saxutils import escape
+
+_ATTRIB_ENTITIES = {'"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#09;'}
+
+
+class XmlWriter(object):
+    """
+    Emits XML text to a file-like object in chunks of roughly ``chunk_size`` characters.
+
+    Elements are written with ``open``/``close`` pairs. An element without text or
+    children is written in the short ``<Tag />`` form, and whitespace in attribute values
+    is written as character references so it survives attribute normalisation. Both
+    match the output of ElementTree.
+    If ``encoding`` is given, ``fp`` is expected to accept bytes.
+    """
+
+    def __init__(self, fp, encoding=None, chunk_size=65536):
+        self.fp = fp
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self._buffer = []
+        self._buffered = 0
+        self._stack = []
+
+    def _write(self, text):
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            chunk = ''.join(self._buffer)
+            self._buffer = []
+            self._buffered = 0
+            self.fp.write(chunk if self.encoding is None else chunk.encode(self.encoding))
+
+    def open(self, tag, attrib=None, text=None):
+        if self._stack and not self._stack[-1][1]:
+            self._write('>')
+            self._stack[-1][1] = True
+        parts = ['<', tag]
+        if attrib:
+            for name, value in attrib.items():
+                parts.append(' %s="%s"' % (name, escape(value, _ATTRIB_ENTITIES)))
+        if text:
+            parts.append('>')
+            parts.append(escape(text))
+        self._write(''.join(parts))
+        self._stack.append([tag, bool(text)])
+
+    def close(self):
+        tag, opened = self._stack.pop()
+        self._write('</%s>' % tag if opened else ' />')
+
+    def write_primitive(self, value):
+        """Writes a ``{'tag', 'attrib', 'children', 'text'}`` dictionary and its children."""
+        self.open(value['tag'], value.get('attrib'), value.get('text'))
+        for child in value.get('children', ()):
+            self.write_primitive(child)
+        self.close()
@@ -0,0 +1,151 @@
+"""Incremental decoding of documents made of many repeated record elements"""
+import asyncio
+import time
+from xml.etree import ElementTree
+
+from schematics.exceptions import DataError
+
+from .etree import iter_file_chunks
+from .mixins import ModelSpecMixin
+
+
+class _RecordSpec(ModelSpecMixin):
+    pass
+
+
+def _compile_path(path):
+    if path is None:
+        return None
+    if isinstance(path, str):
+        path = path.strip('/').split('/')
+    return tuple(path)
+
+
+class RecordDecoder(object):
+    """
+    Turns a stream of ElementTree ``start``/``end`` events into decoded models.
+
+    Records are the elements found at ``path``, a ``/``-separated sequence of tag names
+    starting from the document's root element in which ``*`` matches any tag. By default
+    every child of the root element is a record. The model class for each record is
+    chosen from ``model`` in the same way as for an ``XmlChildren`` field.
+
+    Each element is released as soon as it has been decoded or skipped, so memory use
+    depends on the size of a record rather than the size of the document.
+
+    If ``only`` is given, just the fields it names are decoded from each record, as
+    described for ``Projection``.
+    """
+
+    def __init__(self, model, path=None, allow_subclasses=False, strict=False, only=None):
+        self.spec = _RecordSpec(model, allow_subclasses=allow_subclasses)
+        self.path = _compile_path(path)
+        self.strict = strict
+        self.only = only
+        self._stack = []
+        self._record_depth = None
+
+    def _is_record(self):
+        if self.path is None:
+            return len(self._stack) == 2
+        return len(self.path) == len(self._stack) and all(
+            part == '*' or part == element.tag for part, element in zip(self.path, self._stack)
+        )
+
+    def _release(self, element):
+        element.clear()
+        if self._stack:
+            self._stack[-1].remove(element)
+
+    def decode(self, element):
+        candidate = self.spec._find_candidate(element.tag)
+        if candidate is None:
+            if self.strict:
+                raise DataError({element.tag: 'Rogue record'})
+            return None
+        if self.only is not None:
+            return candidate.projection(self.only).decode(element, self.strict)
+        return candidate.from_element(element, self.strict)
+
+    def feed(self, event, element):
+        """
+        Processes a single parser event, returning the decoded model if it completed
+        a record and ``None`` otherwise.
+        """
+        if event == 'start':
+            self._stack.append(element)
+            if self._record_depth is None and self._is_record():
+                self._record_depth = len(self._stack)
+            return None
+
+        depth = len(self._stack)
+        self._stack.pop()
+        result = None
+        if self._record_depth is not None:
+            if depth > self._record_depth:
+                return None
+            self._record_depth = None
+            result = self.decode(element)
+        self._release(element)
+        return result
+
+
+def iter_models(source, model, path=None, allow_subclasses=False, strict=False, mmap=True, chunk_size=1 << 20,
+                only=None):
+    """
+    Yields a model for each record in ``source``, a file name or binary file object,
+    while it is being parsed. See ``RecordDecoder`` for the meaning of the other arguments.
+
+    As with ``XmlElementModel.from_file``, a file name is memory-mapped by default and fed
+    to the parser ``chunk_size`` bytes at a time, as by ``iter_file_chunks``. With ``mmap``
+    unset, or for file objects, the source is read by ``ElementTree.iterparse`` instead.
+    """
+    decoder = RecordDecoder(model, path, allow_subclasses, strict, only)
+    if not mmap or hasattr(source, 'read'):
+        yield from _decode_events(decoder, ElementTree.iterparse(source, events=('start', 'end')))
+        return
+
+    parser = ElementTree.XMLPullParser(events=('start', 'end'))
+    for chunk in iter_file_chunks(source, True, chunk_size):
+        parser.feed(chunk)
+        yield from _decode_events(decoder, parser.read_events())
+    parser.close()
+    yield from _decode_events(decoder, parser.read_events())
+
+
+def _decode_events(decoder, events):
+    for event, element in events:
+        result = decoder.feed(event, element)
+        if result is not None:
+            yield result
+
+
+async def aiter_models(reader, model, path=None, allow_subclasses=False, strict=False, chunk_size=65536,
+                       time_budget=0.005, only=None):
+    """
+    Asynchronously yields a model for each record read from ``reader``, an object with a
+    coroutine ``read(n)`` method such as an ``asyncio.StreamReader``. See ``RecordDecoder``
+    for the meaning of the other arguments.
+
+    Data is read and parsed ``chunk_size`` bytes at a time. Whenever decoding has run for
+    ``time_budget`` seconds without giving the event loop a turn, the generator yields to
+    the loop before continuing; pass ``None`` to disable this.
+    """
+    decoder = RecordDecoder(model, path, allow_subclasses, strict, only)
+    parser = ElementTree.XMLPullParser(events=('start', 'end'))
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    while True:
+        chunk = await reader.read(chunk_size)
+        if chunk:
+            parser.feed(chunk)
+        else:
+            parser.close()
+        for event, element in parser.read_events():
+            result = decoder.feed(event, element)
+            if result is not None:
+                yield result
+            if deadline is not None and time.perf_counter() >= deadline:
+                await asyncio.sleep(0)
+                deadline = time.perf_counter() + time_budget
+        if not chunk:
+            break
@@ -1,23 +1,70 @@
+from functools import lru_cache
+
 from schematics.exceptions import ConversionError
 
+from schematics_xmlelem.mixins import _overrides
+
 
 class XmlBaseType(object):
-    def __init__(self, choices=None, **kwargs):
+    def __init__(self, choices=None, memo_size=None, **kwargs):
+        """
+        :param choices:
+            If given, the only native values which will be accepted
+        :param memo_size:
+            If given, the results of up to this many distinct ``to_native`` calls are
+            cached. Intended for custom types with expensive conversions.
+        """
         super().__init__(**kwargs)
         self.choices = choices
+        if memo_size:
+            self.to_native = lru_cache(maxsize=memo_size)(self.to_native)
+
+    @property
+    def choices(self):
+        return self._choices
+
+    @choices.setter
+    def choices(self, choices):
+        self._choices = choices
+        try:
+            self._choice_set = None if choices is None else frozenset(choices)
+        except TypeError:
+            self._choice_set = None
 
     def _validate_choice(self, value):
-        if self.choices is not None:
-            if value not in self.choices:
+        if self._choices is not None:
+            try:
+                valid = value in self._choice_set
+            except TypeError:
+                # Unhashable values, or choices which could not be made into a set
+                valid = value in self._choices
+            if not valid:
                 raise ConversionError('Value was not in the set of allowed choices')
         return value
 
+    def _validate_choices(self, values):
+        if self._choices is not None:
+            try:
+                valid = self._choice_set.issuperset(values)
+            except (AttributeError, TypeError):
+                valid = all(value in self._choices for value in values)
+            if not valid:
+                raise ConversionError('Value was not in the set of allowed choices')
+        return values
+
     def to_primitive(self, value):
         raise NotImplementedError()
 
     def to_native(self, value):
         raise NotImplementedError()
 
+    def to_native_many(self, values):
+        """
+        Converts a sequence of primitive values, returning a list. Built-in types convert
+        them in one pass, unless a subclass customises ``to_native``.
+        """
+        return [self.to_native(value) for value in values]
+
 
 class XmlStringType(XmlBaseType):
     def to_primitive(self, value):
@@ -26,6 +73,11 @@ class XmlStringType(XmlBaseType):
     def to_native(self, value):
         return self._validate_choice(value)
 
+    def to_native_many(self, values):
+        if _overrides(self, XmlStringType, 'to_native'):
+            return XmlBaseType.to_native_many(self, values)
+        return self._validate_choices(list(values))
+
 
 class XmlIntType(XmlBaseType):
     def to_primitive(self, value):
@@ -34,6 +86,11 @@ class XmlIntType(XmlBaseType):
     def to_native(self, value):
         return self._validate_choice(int(value))
 
+    def to_native_many(self, values):
+        if _overrides(self, XmlIntType, 'to_native'):
+            return XmlBaseType.to_native_many(self, values)
+        return self._validate_choices(list(map(int, values)))
+
 
 class XmlFloatType(XmlBaseType):
     def to_primitive(self, value):
@@ -42,6 +99,11 @@ class XmlFloatType(XmlBaseType):
     def to_native(self, value):
         return self._validate_choice(float(value))
 
+    def to_native_many(self, values):
+        if _overrides(self, XmlFloatType, 'to_native'):
+            return XmlBaseType.to_native_many(self, values)
+        return self._validate_choices(list(map(float, values)))
+
 
 BOOL_ONE_ZERO = ['1', '0']
 BOOL_TRUE_FALSE = ['true', 'false']
@@ -62,12 +124,86 @@ def _compare_reference_value(reference, value, case_sensitive):
     return reference == value
 
 
+class _ReferenceTable(object):
+    """
+    Finds the first of a sequence of ``(reference, result)`` pairs whose reference matches
+    a value according to ``_compare_reference_value``, using dictionary lookups.
+    """
+
+    def __init__(self, pairs, case_sensitive):
+        self.case_sensitive = case_sensitive
+        self.strings = {}
+        self.by_class = {}
+        self.unhashable = []
+        for rank, (reference, result) in enumerate(pairs):
+            if isinstance(reference, str):
+                key = reference if case_sensitive else reference.lower()
+                self.strings.setdefault(key, (rank, result))
+                continue
+            try:
+                self.by_class.setdefault(reference.__class__, {}).setdefault(reference, (rank, result))
+            except TypeError:
+                self.unhashable.append((rank, reference, result))
+
+    def lookup(self, value, default=None):
+        found = None
+        if self.strings:
+            found = self.strings.get(value if self.case_sensitive else value.lower())
+        for reference_class, table in self.by_class.items():
+            try:
+                converted = reference_class(value)
+            except ValueError:
+                continue
+            hit = table.get(converted)
+            if hit is not None and (found is None or hit[0] < found[0]):
+                found = hit
+        for rank, reference, result in self.unhashable:
+            if found is not None and found[0] < rank:
+                break
+            if _compare_reference_value(reference, value, self.case_sensitive):
+                return result
+        return default if found is None else found[1]
+
+
+_NOT_FOUND = object()
+
+
+def _clear_memo(type_):
+    # Results memoised with ``memo_size`` were looked up in the previous table
+    cache_clear = getattr(type_.to_native, 'cache_clear', None)
+    if cache_clear is not None:
+        cache_clear()
+
+
 class XmlBoolType(XmlBaseType):
     def __init__(self, bool_values=BOOL_ONE_ZERO, case_sensitive=False, **kwargs):
         super().__init__(**kwargs)
-        self.bool_values = bool_values
+        self._bool_values = bool_values
         self.case_sensitive = case_sensitive
 
+    @property
+    def bool_values(self):
+        return self._bool_values
+
+    @bool_values.setter
+    def bool_values(self, bool_values):
+        self._bool_values = bool_values
+        self._build_table()
+
+    @property
+    def case_sensitive(self):
+        return self._case_sensitive
+
+    @case_sensitive.setter
+    def case_sensitive(self, case_sensitive):
+        self._case_sensitive = case_sensitive
+        self._build_table()
+
+    def _build_table(self):
+        bool_values = self._bool_values
+        self._table = _ReferenceTable([(bool_values[0], True), (bool_values[1], False)], self._case_sensitive)
+        _clear_memo(self)
+
     def to_primitive(self, value):
         if value:
             return str(self.bool_values[0])
@@ -75,25 +211,45 @@ class XmlBoolType(XmlBaseType):
             return str(self.bool_values[1])
 
     def to_native(self, value):
-        if _compare_reference_value(self.bool_values[0], value, self.case_sensitive):
-            return True
-        elif _compare_reference_value(self.bool_values[1], value, self.case_sensitive):
-            return False
-        else:
+        result = self._table.lookup(value, _NOT_FOUND)
+        if result is _NOT_FOUND:
             raise ConversionError('Value not recognised as a boolean')
+        return result
 
 
 class XmlEnumType(XmlBaseType):
     def __init__(self, enum_class, case_sensitive=False, **kwargs):
         super().__init__(**kwargs)
-        self.enum_class = enum_class
+        self._enum_class = enum_class
         self.case_sensitive = case_sensitive
 
+    @property
+    def enum_class(self):
+        return self._enum_class
+
+    @enum_class.setter
+    def enum_class(self, enum_class):
+        self._enum_class = enum_class
+        self._build_table()
+
+    @property
+    def case_sensitive(self):
+        return self._case_sensitive
+
+    @case_sensitive.setter
+    def case_sensitive(self, case_sensitive):
+        self._case_sensitive = case_sensitive
+        self._build_table()
+
+    def _build_table(self):
+        self._table = _ReferenceTable([(variant.value, variant) for variant in self._enum_class], self._case_sensitive)
+        _clear_memo(self)
+
     def to_primitive(self, value):
         return str(value.value)
 
     def to_native(self, value):
-        for variant in self.enum_class:
-            if _compare_reference_value(variant.value, value, self.case_sensitive):
-                return variant
-        raise ConversionError('Value not recognised as a variant of enum')
+        variant = self._table.lookup(value, _NOT_FOUND)
+        if variant is _NOT_FOUND:
+            raise ConversionError('Value not recognised as a variant of enum')
+        return variant
@@ -0,0 +1,97 @@
+"""Runs the ``validate_<field>`` methods of models, singly or in batches"""
+from collections import OrderedDict
+
+from schematics.exceptions import BaseError, ConversionError, DataError, FieldError
+from schematics.undefined import Undefined
+
+from .model import LazyValue, XmlElementModel
+
+
+def _field_value(model, data, field_name):
+    value = data.get(field_name, Undefined)
+    if type(value) is LazyValue:
+        value = data[field_name] = value.decode()
+    return value
+
+
+def _error_detail(e):
+    if isinstance(e, (DataError, FieldError)):
+        return e.errors
+    if isinstance(e, BaseError):
+        return e
+    return ConversionError(str(e))
+
+
+def run_validators(model):
+    """
+    Runs the validators of ``model`` itself, not of nested models, returning
+    ``{field_name: errors}`` for those which failed.
+    """
+    errors = {}
+    data = model._data
+    for field_name, validator in model._schema.validation_plan:
+        try:
+            value = _field_value(model, data, field_name)
+            if value is not Undefined:
+                validator(model, data, value, None)
+        except (BaseError, ValueError) as e:
+            errors[field_name] = _error_detail(e)
+    return errors
+
+
+def _validate_batch(models):
+    errors = {}
+    groups = OrderedDict()
+    for i, model in enumerate(models):
+        groups.setdefault(model._schema, []).append(i)
+
+    for schema, indices in groups.items():
+        # Each validator is run over every instance before moving on to the next one
+        for field_name, validator in schema.validation_plan:
+            for i in indices:
+                model = models[i]
+                data = model._data
+                try:
+                    value = _field_value(model, data, field_name)
+                    if value is not Undefined:
+                        validator(model, data, value, None)
+                except (BaseError, ValueError) as e:
+                    errors.setdefault(i, {})[field_name] = _error_detail(e)
+
+        # Nested models are validated in one batch per child field
+        for field_name in schema.children:
+            nested = []
+            owners = []
+            for i in indices:
+                if field_name in errors.get(i, ()):
+                    continue
+                try:
+                    value = _field_value(models[i], models[i]._data, field_name)
+                except (BaseError, ValueError) as e:
+                    errors.setdefault(i, {})[field_name] = _error_detail(e)
+                    continue
+                if isinstance(value, XmlElementModel):
+                    nested.append(value)
+                    owners.append((i, None))
+                elif isinstance(value, list):
+                    for j, item in enumerate(value):
+                        if isinstance(item, XmlElementModel):
+                            nested.append(item)
+                            owners.append((i, j))
+            for k, nested_errors in _validate_batch(nested).items():
+                i, j = owners[k]
+                if j is None:
+                    errors.setdefault(i, {})[field_name] = nested_errors
+                else:
+                    errors.setdefault(i, {}).setdefault(field_name, {})[j] = nested_errors
+    return errors
+
+
+def validate_many(models):
+    """
+    Validates a sequence of models, including the models nested within them, without
+    stopping at the first failure. Each validator runs across all instances of its model
+    in turn. Returns ``{index: errors}`` for the models which failed, in the format of
+    ``DataError.errors``.
+    """
+    return _validate_batch(list(models))
@@ -1,15 +1,18 @@
+import enum
+import pickle
 import unittest
 
-from schematics.exceptions import DataError
+from schematics.exceptions import DataError, UndefinedValueError, ConversionError
 from src.xmltojson.xmltojson import unparse
 from xmltojson import parse
 
-from schematics_xmlelem.attributes import XmlAttribute
+from schematics_xmlelem import profiling
+from schematics_xmlelem.attributes import XmlAttribute, XmlAttributeBase
 from schematics_xmlelem.children import XmlChildContent, XmlChildrenContent, XmlNestedChildList, XmlBooleanChild, \
     XmlChildren
 from schematics_xmlelem.content import XmlContent
 from schematics_xmlelem.model import XmlElementModel
-from schematics_xmlelem.types import XmlIntType, XmlStringType
+from schematics_xmlelem.types import XmlIntType, XmlStringType, XmlEnumType, XmlBoolType, BOOL_TRUE_FALSE
 
 
 class Foo(XmlElementModel):
@@ -56,6 +59,94 @@ class CaseInsensitive(XmlElementModel):
     tag_case_sensitive = False
 
 
+class PrefixAttribute(XmlAttributeBase):
+    def matches(self, field_name, attrib_name):
+        return attrib_name.startswith('x-')
+
+    def from_attr(self, field_name, value):
+        return value
+
+
+class Attribs(XmlElementModel):
+    first_name = XmlAttribute(XmlStringType(), default=None)
+    exact = XmlAttribute(XmlStringType(), serialized_name='EXACT', case_sensitive=True, default=None)
+    extension = PrefixAttribute(default=None)
+    x_shadowed = XmlAttribute(XmlStringType(), serialized_name='x-shadowed', default=None)
+
+
+class Foo4(XmlElementModel):
+    items = XmlNestedChildList(Parent, allow_subclasses=True)
+
+
+class ReversedChildren(XmlChildren):
+    def incorporate_child(self, match_result, old_value, child):
+        return [match_result(raw_value=child)] + old_value
+
+
+class Foo5(XmlElementModel):
+    children = ReversedChildren(Parent, allow_subclasses=True)
+    baz = XmlChildrenContent(XmlIntType())
+
+
+class CompactBar(XmlElementModel):
+    compact = True
+    tag_name = 'Bar'
+
+    field1 = XmlAttribute(XmlIntType(), default=None)
+    content = XmlContent(XmlStringType())
+
+
+class CompactChild(CompactBar):
+    field2 = XmlAttribute(XmlStringType(), default=None)
+
+
+class LazyFoo(XmlElementModel):
+    lazy = True
+
+    header = XmlAttribute(XmlIntType(), default=None)
+    bars = XmlNestedChildList(Bar)
+    values = XmlChildrenContent(XmlIntType())
+
+
+class CachedBar(XmlElementModel):
+    compact = True
+    cache_exports = True
+
+    field1 = XmlAttribute(XmlIntType(), default=None)
+    content = XmlContent(XmlStringType())
+
+
+class CachedFoo(XmlElementModel):
+    cache_exports = True
+    compiled = True
+
+    bars = XmlChildren(CachedBar)
+    others = XmlChildren(Bar)
+
+
+class InternedFoo(Foo):
+    tag_name = 'Foo'
+    intern_exports = True
+
+
+class CompiledInternedFoo(InternedFoo):
+    tag_name = 'Foo'
+    compiled = True
+
+
+class InternedFoo2(XmlElementModel):
+    intern_exports = True
+    compiled = True
+
+    bars = XmlNestedChildList(CompactBar)
+
+
+class Dispatch(XmlElementModel):
+    first = XmlChildContent(XmlStringType(), serialized_name='Item', default=None)
+    second = XmlChildContent(XmlStringType(), serialized_name='ITEM', case_sensitive=True, default=None)
+    parents = XmlChildren(Parent, allow_subclasses=True)
+
+
 class BasicTestCase(unittest.TestCase):
     def test_model(self):
         input_json = parse(
@@ -167,3 +258,258 @@ class BasicTestCase(unittest.TestCase):
 
         xml = unparse(case_insensitive_bad.to_primitive())
         self.assertEqual(xml, '<CaseInsensitive />')
+
+    def test_attribute_matching(self):
+        attribs = Attribs(raw_value=parse('<Attribs FIRSTNAME="a" exact="b" EXACT="c" x-shadowed="d" />'))
+
+        self.assertEqual(attribs.first_name, 'a')
+        self.assertEqual(attribs.exact, 'c')
+        self.assertEqual(attribs.extension, 'd')
+        self.assertIsNone(attribs.x_shadowed)
+
+        with self.assertRaises(DataError):
+            Attribs().import_data(parse('<Attribs exact="b" />'), strict=True)
+
+    def test_child_dispatch(self):
+        dispatch = Dispatch(raw_value=parse('<Dispatch><ITEM>a</ITEM><Child2 /><Parent /></Dispatch>'))
+
+        self.assertEqual(dispatch.first, 'a')
+        self.assertIsNone(dispatch.second)
+        self.assertIsInstance(dispatch.parents[0], Child2)
+        self.assertIsInstance(dispatch.parents[1], Parent)
+
+        class Child3(Parent):
+            pass
+
+        dispatch = Dispatch(raw_value=parse('<Dispatch><Child3 /></Dispatch>'))
+        self.assertIsInstance(dispatch.parents[0], Child3)
+
+        with self.assertRaises(DataError):
+            Dispatch().import_data(parse('<Dispatch><Rogue /></Dispatch>'), strict=True)
+
+    def test_subclass_registry(self):
+        self.assertEqual(Parent._schema.subclasses[:3], [Parent, Child1, Child2])
+        self.assertIs(Parent._schema.find_subclass('Child2'), Child2)
+        self.assertIsNone(Child1._schema.find_subclass('Child2'))
+
+        foo4 = Foo4(raw_value=parse('<Foo4><Items><Child2 /><Other /><Child1 /></Items></Foo4>'))
+        self.assertEqual([type(item) for item in foo4.items], [Child2, Child1])
+
+    def test_repeated_children(self):
+        foo5 = Foo5(raw_value=parse(
+            '<Foo5><Child1 /><Baz>1</Baz><Child2 /><Baz>2</Baz>' + '<Baz>3</Baz>' * 1000 + '</Foo5>'
+        ))
+
+        self.assertEqual([type(child) for child in foo5.children], [Child2, Child1])
+        self.assertEqual(len(foo5.baz), 1002)
+        self.assertEqual(foo5.baz[:3], [1, 2, 3])
+        self.assertEqual(Foo5().baz, [])
+
+        # Builder methods defined alongside ``incorporate_child`` take part in the import
+        class TupleChildren(ReversedChildren):
+            def incorporate_child(self, match_result, old_value, child):
+                return old_value + [match_result(raw_value=child)]
+
+            def finish_children(self, state):
+                return tuple(state)
+
+        model = type('TupleFoo', (XmlElementModel,), {'children': TupleChildren(Parent, allow_subclasses=True)})
+        children = model(raw_value=parse('<TupleFoo><Child1 /><Child2 /></TupleFoo>')).children
+        self.assertEqual([type(child) for child in children], [Child1, Child2])
+        self.assertIsInstance(children, tuple)
+
+    def test_compact_storage(self):
+        bar = CompactBar(raw_value=parse('<Bar field1="2">Item</Bar>'))
+
+        self.assertFalse(hasattr(bar, '__dict__'))
+        self.assertEqual(bar.field1, 2)
+        self.assertEqual(bar.content, 'Item')
+        self.assertEqual(dict(bar._data), {'field1': 2, 'content': 'Item'})
+        self.assertEqual(unparse(bar.to_primitive()), '<Bar field1="2">Item</Bar>')
+
+        del bar.content
+        self.assertNotIn('content', bar._data)
+        with self.assertRaises(UndefinedValueError):
+            bar.content
+        with self.assertRaises(KeyError):
+            bar._data['missing'] = 1
+
+        child = CompactChild(field2='x', content='y')
+        self.assertFalse(hasattr(child, '__dict__'))
+        self.assertEqual(dict(child._data), {'field1': None, 'field2': 'x', 'content': 'y'})
+        self.assertEqual(dict(pickle.loads(pickle.dumps(child))._data), dict(child._data))
+
+        with self.assertRaises(TypeError):
+            class NotCompactChild(CompactBar):
+                compact = False
+
+        class StillCompactChild(CompactBar):
+            compact = True
+
+        self.assertFalse(hasattr(StillCompactChild(content='z'), '__dict__'))
+
+    def test_lazy(self):
+        lazy = LazyFoo(raw_value=parse(
+            '<LazyFoo header="1"><Bars><Bar>a</Bar><Bar field1="2">b</Bar></Bars><Values>x</Values></LazyFoo>'
+        ))
+
+        self.assertEqual(lazy.header, 1)
+        self.assertEqual(type(lazy._data['bars']).__name__, 'LazyValue')
+        self.assertEqual([bar.content for bar in lazy.bars], ['a', 'b'])
+        self.assertIsInstance(lazy._data['bars'], list)
+        with self.assertRaises(ValueError):
+            lazy.values
+
+        with self.assertRaises(DataError) as cm:
+            LazyFoo(raw_value=parse('<LazyFoo><Values>1</Values><Values>x</Values></LazyFoo>')).force()
+        self.assertIn('values', cm.exception.errors)
+
+        lazy = LazyFoo(raw_value=parse('<LazyFoo><Bars><Bar>a</Bar></Bars><Values>3</Values></LazyFoo>'))
+        self.assertEqual(unparse(lazy.to_primitive()), '<LazyFoo><Bars><Bar>a</Bar></Bars><Values>3</Values></LazyFoo>')
+        self.assertEqual(lazy.force().values, [3])
+
+    def test_cached_exports(self):
+        foo = CachedFoo(raw_value=parse('<CachedFoo><CachedBar>a</CachedBar><CachedBar>b</CachedBar></CachedFoo>'))
+        first = foo.to_primitive()
+        self.assertIs(foo.to_primitive(), first)
+
+        foo.bars[1].content = 'c'
+        second = foo.to_primitive()
+        self.assertIsNot(second, first)
+        self.assertIs(second['children'][0], first['children'][0])
+        self.assertEqual(unparse(second), '<CachedFoo><CachedBar>a</CachedBar><CachedBar>c</CachedBar></CachedFoo>')
+
+        foo.bars.append(CachedBar(content='d'))
+        self.assertEqual(len(foo.to_primitive()['children']), 3)
+        del foo.bars[0].field1
+        foo.bars[0].field1 = 5
+        self.assertEqual(foo.to_primitive()['children'][0]['attrib'], {'field1': '5'})
+
+        # Models without cache_exports can't report changes, so their parents are re-exported
+        foo.others = [Bar(content='x')]
+        exported = foo.to_primitive()
+        foo.others[0].content = 'y'
+        self.assertIsNot(foo.to_primitive(), exported)
+        self.assertEqual(foo.to_primitive()['children'][-1]['text'], 'y')
+
+        foo.import_data(parse('<CachedFoo><CachedBar>z</CachedBar></CachedFoo>'))
+        self.assertEqual([child['text'] for child in foo.to_primitive()['children']], ['a', 'c', 'd', 'z', 'y'])
+        self.assertEqual(pickle.loads(pickle.dumps(foo)).to_primitive(), foo.to_primitive())
+
+    def test_intern_exports(self):
+        raw = parse('<Foo field1="1" field2="A"><Bar>x</Bar><Baz>a</Baz><Baz>b</Baz><Check/></Foo>')
+        expected = Foo(raw_value=raw).to_primitive()
+        for model in (InternedFoo, CompiledInternedFoo):
+            primitive = model(raw_value=raw).to_primitive()
+            self.assertEqual(unparse(primitive), unparse(expected))
+            leaves = primitive['children']
+            self.assertIs(leaves[0]['attrib'], leaves[1]['attrib'])
+            self.assertEqual(leaves[0]['children'], ())
+            self.assertIs(leaves[1]['tag'], leaves[2]['tag'])
+            with self.assertRaises(TypeError):
+                leaves[0]['attrib']['x'] = 'y'
+            self.assertEqual(model(raw_value=primitive).to_primitive(), primitive)
+
+        primitive = InternedFoo2(bars=[]).to_primitive()
+        self.assertEqual(primitive['children'][0]['children'], ())
+        self.assertEqual(unparse(primitive), '<InternedFoo2><Bars /></InternedFoo2>')
+
+        # Elements returned by other fields may be kept by the field, so are left alone
+        template = {'tag': 'Fixed', 'attrib': {}, 'children': [], 'text': None}
+
+        class FixedChild(XmlChildContent):
+            def to_children(self, field_name, value):
+                return [template]
+
+        for compiled in (False, True):
+            model = type('InternedFixed', (XmlElementModel,), {
+                'intern_exports': True, 'compiled': compiled, 'fixed': FixedChild(XmlStringType(), default=None),
+            })
+            self.assertEqual(model(fixed='x').to_primitive()['children'], [template])
+            self.assertEqual(template, {'tag': 'Fixed', 'attrib': {}, 'children': [], 'text': None})
+            self.assertIs(type(template['attrib']), dict)
+
+    def test_lookup_types(self):
+        class Colour(enum.Enum):
+            RED = 'Red'
+            ONE = 1
+            ALSO_RED = 'RED'
+
+        colour = XmlEnumType(Colour)
+        self.assertIs(colour.to_native('red'), Colour.RED)
+        self.assertIs(colour.to_native('1'), Colour.ONE)
+        self.assertIs(XmlEnumType(Colour, case_sensitive=True).to_native('RED'), Colour.ALSO_RED)
+        with self.assertRaises(ConversionError):
+            colour.to_native('blue')
+
+        self.assertIs(XmlBoolType(BOOL_TRUE_FALSE).to_native('TRUE'), True)
+        self.assertIs(XmlBoolType().to_native('0'), False)
+        with self.assertRaises(ConversionError):
+            XmlBoolType(case_sensitive=True).to_native('true')
+
+        colour.case_sensitive = True
+        self.assertIs(colour.to_native('RED'), Colour.ALSO_RED)
+        colour.enum_class = enum.Enum('Shade', {'DARK': 'Dark'})
+        self.assertEqual(colour.to_native('Dark').name, 'DARK')
+        with self.assertRaises(ConversionError):
+            colour.to_native('Red')
+
+        flag = XmlBoolType(memo_size=4)
+        self.assertIs(flag.to_native('1'), True)
+        flag.bool_values = BOOL_TRUE_FALSE
+        self.assertIs(flag.to_native('true'), True)
+        with self.assertRaises(ConversionError):
+            flag.to_native('1')
+
+        choice = XmlIntType(choices=[1, 2])
+        self.assertEqual(choice.to_native('2'), 2)
+        with self.assertRaises(ConversionError):
+            choice.to_native('3')
+        choice.choices = [3]
+        self.assertEqual(choice.to_native('3'), 3)
+        self.assertEqual(XmlStringType(choices=[['a']]).to_native(['a']), ['a'])
+
+    def test_memo_size(self):
+        calls = []
+
+        class Expensive(XmlStringType):
+            def to_native(self, value):
+                calls.append(value)
+                return value.upper()
+
+        expensive = Expensive(memo_size=2)
+        self.assertEqual([expensive.to_native(v) for v in 'abab'], ['A', 'B', 'A', 'B'])
+        self.assertEqual(calls, ['a', 'b'])
+
+    def test_profiling(self):
+        document = parse('<Foo2 rogue="1"><Bars><Bar>a</Bar><Bar field1="2">b</Bar></Bars><Rogue /></Foo2>')
+
+        with profiling.profile() as profiler:
+            Foo2(raw_value=document).to_primitive()
+        Foo2(raw_value=document)
+
+        stats = profiler.as_dict()
+        self.assertEqual(stats['models']['test_basic.Foo2']['import']['calls'], 1)
+        self.assertEqual(stats['models']['test_basic.Foo2']['export']['calls'], 1)
+        self.assertEqual(stats['models']['test_basic.Bar']['import']['calls'], 2)
+        self.assertEqual(stats['fields']['test_basic.Bar.field1']['calls'], 1)
+        self.assertEqual(stats['fields']['test_basic.Foo2.bars']['elements'], 1)
+        self.assertEqual(stats['rogue']['test_basic.Foo2'], {'attribute:rogue': 1, 'child:Rogue': 1})
+        self.assertIn('test_basic.Foo2.bars', profiler.report())
+        self.assertIsNone(profiling.active)
+
+        document = parse(
+            '<LazyFoo header="1" rogue="2"><Bars><Bar>a</Bar></Bars><Values>1</Values><Values>2</Values>'
+            '<Rogue /></LazyFoo>'
+        )
+        bar = CachedBar(field1=1, content='a')
+        with profiling.profile() as profiler:
+            LazyFoo(raw_value=document)
+            primitive = bar.to_primitive()
+            self.assertIs(bar.to_primitive(), primitive)
+
+        stats = profiler.as_dict()
+        self.assertEqual(stats['fields']['test_basic.LazyFoo.header']['calls'], 1)
+        self.assertEqual(stats['fields']['test_basic.LazyFoo.values']['elements'], 2)
+        self.assertEqual(stats['rogue']['test_basic.LazyFoo'], {'attribute:rogue': 1, 'child:Rogue': 1})
+        self.assertEqual(stats['models']['test_basic.CachedBar']['export']['calls'], 2)
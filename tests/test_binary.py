@@ -0,0 +1,110 @@
+import datetime
+import enum
+import sys
+import unittest
+
+from xmltojson import parse
+
+from schematics_xmlelem.attributes import XmlAttribute
+from schematics_xmlelem.binary import MAGIC, SnapshotError
+from schematics_xmlelem.children import XmlChildren
+from schematics_xmlelem.model import XmlElementModel
+from schematics_xmlelem.types import XmlEnumType
+from test_basic import Foo, Foo2, Foo3, Child1, Child2, CompactBar, LazyFoo
+
+
+class Colour(enum.Enum):
+    RED = 'red'
+
+
+class Painted(XmlElementModel):
+    colour = XmlAttribute(XmlEnumType(Colour), default=None)
+    point = XmlAttribute(None, default=None)
+
+
+class Gallery(XmlElementModel):
+    paintings = XmlChildren(Painted)
+
+
+class BinaryTestCase(unittest.TestCase):
+    def assertRoundTrips(self, model):
+        restored = type(model).loads_binary(model.dumps_binary())
+        self.assertIs(type(restored), type(model))
+        self.assertEqual(dict(restored._data).keys(), dict(model._data).keys())
+        return restored
+
+    def test_round_trip(self):
+        foo = Foo(raw_value=parse('<Foo field1="23" field2="B">c<Bar>b</Bar><Baz>1</Baz><Check/><BarNull1/></Foo>'))
+        self.assertEqual(self.assertRoundTrips(foo).to_primitive(), foo.to_primitive())
+
+        foo2 = Foo2(raw_value=parse('<Foo2><Bars><Bar>a</Bar><Bar field1="2">b</Bar></Bars></Foo2>'))
+        self.assertEqual(self.assertRoundTrips(foo2).to_primitive(), foo2.to_primitive())
+
+        foo3 = self.assertRoundTrips(Foo3(children=[Child1(field1=1), Child2(field2='x')]))
+        self.assertEqual([type(child) for child in foo3.children], [Child1, Child2])
+
+        self.assertEqual(self.assertRoundTrips(CompactBar(field1=1, content='x')).content, 'x')
+        self.assertEqual(LazyFoo.loads_binary(LazyFoo(raw_value=parse('<LazyFoo><Values>3</Values></LazyFoo>'))
+                                              .dumps_binary()).values, [3])
+
+        painted = self.assertRoundTrips(Painted(colour=Colour.RED, point=(1, 2)))
+        self.assertIs(painted.colour, Colour.RED)
+        self.assertEqual(painted.point, (1, 2))
+
+    def test_round_trip_mixed_columns(self):
+        points = [
+            (1, 2), [1, 2, 3], [], None, [-1, 2 ** 40], [0.5, 1.5], [1, None], [2 ** 70], 2.5, 'x',
+            {'a': [Colour.RED]}, {1, 2}, [(1, 2)],
+        ]
+        gallery = Gallery(paintings=[Painted(point=point) for point in points])
+        gallery.paintings.append(Painted(colour=Colour.RED, point=gallery.paintings[0]))
+        restored = self.assertRoundTrips(gallery)
+        self.assertEqual([painting.point for painting in restored.paintings[:-1]], points)
+        self.assertIs(restored.paintings[-1].point, restored.paintings[0])
+        self.assertIs(restored.paintings[-1].colour, Colour.RED)
+
+        for points in ([[1, 2], [], None, [3]], [[0.5], None], [4, 5, 6], [[Colour.RED], []]):
+            restored = self.assertRoundTrips(Gallery(paintings=[Painted(point=point) for point in points]))
+            self.assertEqual([painting.point for painting in restored.paintings], points)
+
+    def test_rejects_unsupported_values(self):
+        for point in (datetime.date(2020, 1, 1), [object()]):
+            with self.assertRaises(SnapshotError):
+                Painted(point=point).dumps_binary()
+
+    def test_field_names_not_stored(self):
+        self.assertNotIn(b'field1', Child1(field1=1).dumps_binary())
+
+    def test_rejects_stale_or_mismatched(self):
+        data = Child1(field1=1).dumps_binary()
+        with self.assertRaises(SnapshotError):
+            Child2.loads_binary(data)
+        with self.assertRaises(SnapshotError):
+            Child1.loads_binary(b'garbage')
+
+        fingerprint = Child1._schema.fingerprint
+        try:
+            Child1._schema._fingerprint = b'\0' * 8
+            with self.assertRaises(SnapshotError):
+                Child1.loads_binary(data)
+        finally:
+            Child1._schema._fingerprint = fingerprint
+
+    def test_rejects_renamed_enum_member(self):
+        class Renamed(enum.Enum):
+            CRIMSON = 'red'
+
+        data = Painted(colour=Colour.RED).dumps_binary()
+        module, original = sys.modules[__name__], Colour
+        try:
+            module.Colour = Renamed
+            with self.assertRaises(SnapshotError):
+                Painted.loads_binary(data)
+        finally:
+            module.Colour = original
+
+    def test_rejects_other_python_version(self):
+        data = bytearray(Child1(field1=1).dumps_binary())
+        data[len(MAGIC)] += 1
+        with self.assertRaises(SnapshotError):
+            Child1.loads_binary(bytes(data))
@@ -0,0 +1,109 @@
+import enum
+import unittest
+from xml.etree import ElementTree
+
+from schematics.exceptions import ConversionError
+from xmltojson import parse
+
+from schematics_xmlelem.attributes import XmlAttribute, XmlBooleanAttribute
+from schematics_xmlelem.children import XmlChildContent, XmlChildrenContent
+from schematics_xmlelem.content import XmlContent
+from schematics_xmlelem.model import XmlElementModel
+from schematics_xmlelem.types import XmlIntType, XmlStringType, XmlFloatType, XmlBoolType, XmlEnumType
+
+try:
+    import numpy
+    from schematics_xmlelem.columns import decode_columns
+except ImportError:
+    numpy = None
+
+
+class Colour(enum.Enum):
+    RED = 'red'
+    BLUE = 'blue'
+
+
+class Row(XmlElementModel):
+    id = XmlAttribute(XmlIntType())
+    score = XmlAttribute(XmlFloatType(), default=None)
+    active = XmlAttribute(XmlBoolType(), default=None)
+    colour = XmlAttribute(XmlEnumType(Colour), default=None)
+    grade = XmlAttribute(XmlStringType(choices=['A', 'B']), default=None)
+    hidden = XmlBooleanAttribute()
+    note = XmlChildContent(XmlStringType(), null_value='', default=None)
+    tags = XmlChildrenContent(XmlStringType())
+    content = XmlContent(XmlStringType(), default=None)
+
+
+class HexInt(XmlIntType):
+    def to_native(self, value):
+        return int(value, 16)
+
+
+class Upper(XmlAttribute):
+    def from_attr(self, field_name, value):
+        return value.upper()
+
+
+class Doubled(XmlChildContent):
+    def incorporate_child(self, match_result, old_value, child):
+        return child['text'] * 2
+
+
+class Custom(XmlElementModel):
+    hex = XmlAttribute(HexInt(), default=None)
+    name = Upper(XmlStringType(), default=None)
+    twice = Doubled(XmlStringType(), default=None)
+
+
+ROWS = [
+    '<Row id="1" score="1.5" active="1" colour="RED" grade="A" hidden="hidden"> x <Note>n</Note></Row>',
+    '<Row id="2"><Note/></Row>',
+    '<Row id="3" active="0" colour="blue"><Tags>t</Tags></Row>',
+]
+
+
+@unittest.skipIf(numpy is None, 'numpy is not installed')
+class ColumnsTestCase(unittest.TestCase):
+    def test_decode_columns(self):
+        columns = decode_columns(Row, [parse(row) for row in ROWS])
+
+        self.assertEqual(list(columns), ['id', 'score', 'active', 'colour', 'grade', 'hidden', 'note', 'content'])
+        self.assertEqual(columns['id'].values.tolist(), [1, 2, 3])
+        self.assertEqual(columns['id'].mask.tolist(), [False, False, False])
+        self.assertEqual(columns['score'].values[0], 1.5)
+        self.assertEqual(columns['score'].mask.tolist(), [False, True, True])
+        self.assertEqual(columns['active'].values.tolist(), [True, False, False])
+        self.assertEqual(columns['active'].mask.tolist(), [False, True, False])
+        self.assertEqual(columns['colour'].values.tolist(), [0, -1, 1])
+        self.assertEqual(columns['colour'].categories, [Colour.RED, Colour.BLUE])
+        self.assertEqual(columns['grade'].values.tolist(), ['A', None, None])
+        self.assertEqual(columns['hidden'].values.tolist(), [True, False, False])
+        self.assertEqual(columns['note'].values.tolist(), ['n', '', None])
+        self.assertEqual(columns['content'].values.tolist(), ['x', None, None])
+
+        for field_name, column in columns.items():
+            for i, row in enumerate(ROWS):
+                model = Row(raw_value=parse(row))
+                if not column.mask[i] and column.categories is None:
+                    self.assertEqual(column.values[i], getattr(model, field_name))
+
+    def test_fields_and_elements(self):
+        columns = decode_columns(Row, (ElementTree.fromstring(row) for row in ROWS), fields=['id'])
+        self.assertEqual(list(columns), ['id'])
+        self.assertEqual(columns['id'].values.tolist(), [1, 2, 3])
+
+        with self.assertRaises(ValueError):
+            decode_columns(Row, [], fields=['tags'])
+        with self.assertRaises(ConversionError):
+            decode_columns(Row, [parse('<Row id="1" grade="C" />')])
+
+    def test_customised_types_and_fields(self):
+        rows = [parse('<Custom hex="10" name="a"><Twice>x</Twice></Custom>'), parse('<Custom hex="ff" />')]
+        columns = decode_columns(Custom, rows)
+
+        self.assertEqual(columns['hex'].values.tolist(), [16, 255])
+        self.assertEqual(columns['name'].values.tolist(), ['A', None])
+        self.assertEqual(columns['twice'].values.tolist(), ['xx', None])
+        for field_name, column in columns.items():
+            self.assertEqual(column.values[0], getattr(Custom(raw_value=rows[0]), field_name))
@@ -0,0 +1,175 @@
+import unittest
+
+from schematics.exceptions import DataError, ConversionError
+from xmltojson import parse
+
+from schematics_xmlelem.attributes import XmlAttribute, XmlBooleanAttribute
+from schematics_xmlelem.children import XmlChildContent, XmlChildrenContent, XmlNestedChildList, XmlBooleanChild, \
+    XmlChildren, XmlChild
+from schematics_xmlelem.compiler import compile_model
+from schematics_xmlelem.content import XmlContent
+from schematics_xmlelem.model import XmlElementModel, class_creation_stats
+from schematics_xmlelem.types import XmlIntType, XmlStringType, XmlFloatType, XmlBoolType
+
+
+class Item(XmlElementModel):
+    field1 = XmlAttribute(XmlIntType(), default=None)
+    content = XmlContent(XmlStringType())
+
+
+class SpecialItem(Item):
+    flag = XmlBooleanAttribute()
+
+
+class Root(XmlElementModel):
+    tag_case_sensitive = False
+
+    number = XmlAttribute(XmlFloatType(), default=None)
+    choice = XmlAttribute(XmlStringType(choices=['A', 'B']), default=None)
+    enabled = XmlAttribute(XmlBoolType(), default=None)
+    flag = XmlBooleanAttribute()
+    item = XmlChild(Item, default=None)
+    items = XmlChildren(Item, allow_subclasses=True)
+    name = XmlChildContent(XmlStringType(), null_value='', default=None)
+    check = XmlBooleanChild()
+    values = XmlChildrenContent(XmlIntType())
+    nested = XmlNestedChildList(Item)
+    content = XmlContent(XmlStringType(), strip=False, default=None)
+
+
+class CompiledRoot(Root):
+    tag_case_sensitive = False
+
+
+class CompiledItem(Item):
+    pass
+
+
+compile_model(CompiledRoot)
+compile_model(CompiledItem)
+compile_model(Item)
+
+DOCUMENT = (
+    '<{tag} number="1.5" choice="B" enabled="1" flag="flag" rogue="x">'
+    '  text'
+    '  <Item field1="1">a</Item>'
+    '  <SpecialItem flag="flag">b</SpecialItem>'
+    '  <Name/>'
+    '  <Check/>'
+    '  <Values>1</Values><Values>2</Values>'
+    '  <Nested><Item>c</Item><Item field1="3">d</Item></Nested>'
+    '  <Nested><Item>e</Item></Nested>'
+    '  <Rogue/>'
+    '</{tag}>'
+)
+
+
+class CompilerTestCase(unittest.TestCase):
+    def test_matches_generic(self):
+        generic = Root(raw_value=parse(DOCUMENT.format(tag='ROOT')))
+        compiled = CompiledRoot(raw_value=parse(DOCUMENT.format(tag='compiledroot')))
+
+        self.assertEqual(compiled._data.keys(), generic._data.keys())
+        for key in ('number', 'choice', 'enabled', 'flag', 'name', 'check', 'values', 'content'):
+            self.assertEqual(getattr(compiled, key), getattr(generic, key))
+        self.assertEqual([type(item) for item in compiled.items], [SpecialItem])
+        self.assertEqual([item.content for item in compiled.nested], ['c', 'd', 'e'])
+
+        expected = generic.to_primitive()
+        expected['tag'] = 'CompiledRoot'
+        self.assertEqual(compiled.to_primitive(), expected)
+
+    def test_strict(self):
+        with self.assertRaises(DataError):
+            CompiledItem().import_data(parse('<CompiledItem rogue="1">x</CompiledItem>'), strict=True)
+        with self.assertRaises(DataError):
+            CompiledItem().import_data(parse('<Item>x</Item>'))
+        with self.assertRaises(ConversionError):
+            CompiledRoot(raw_value=parse('<CompiledRoot choice="C" />'))
+
+    def test_subclass_falls_back(self):
+        special = SpecialItem(raw_value=parse('<SpecialItem field1="2" flag="flag">x</SpecialItem>'))
+        self.assertEqual((special.field1, special.flag, special.content), (2, True, 'x'))
+        self.assertEqual(special.to_primitive()['attrib'], {'field1': '2', 'flag': 'flag'})
+
+    def test_source(self):
+        self.assertIn('def import_data', CompiledRoot._schema.compiled_source)
+        self.assertIn('int(attrib_value)', Item._schema.compiled_source)
+        self.assertIsNone(Root._schema.compiled_source)
+
+
+class FirstUse(XmlElementModel):
+    compiled = True
+
+    field1 = XmlAttribute(XmlIntType(), default=None)
+    values = XmlChildrenContent(XmlIntType())
+
+
+class FirstUseChild(FirstUse):
+    pass
+
+
+class LazyFirstUse(XmlElementModel):
+    compiled = True
+    lazy = True
+
+    values = XmlChildrenContent(XmlIntType())
+
+
+class CustomFirstUse(XmlElementModel):
+    compiled = True
+
+    field1 = XmlAttribute(XmlIntType(), default=None)
+
+    def import_data(self, raw_value, strict=False):
+        super().import_data(raw_value, strict)
+        self.field1 += 1
+        return self
+
+    def to_primitive(self):
+        primitive = super().to_primitive()
+        primitive['text'] = 'custom'
+        return primitive
+
+
+class CustomFirstUseChild(CustomFirstUse):
+    pass
+
+
+class LazyCustomFirstUseChild(CustomFirstUse):
+    lazy = True
+
+    values = XmlChildrenContent(XmlIntType())
+
+
+class CompileOnFirstUseTestCase(unittest.TestCase):
+    def test_compiled_on_first_use(self):
+        self.assertIsNone(FirstUseChild._schema.compiled_source)
+        child = FirstUseChild(raw_value=parse('<FirstUseChild field1="1"><Values>2</Values></FirstUseChild>'))
+        self.assertEqual((child.field1, child.values), (1, [2]))
+        self.assertIn('def import_data', FirstUseChild._schema.compiled_source)
+        self.assertIsNone(FirstUse._schema.compiled_source)
+        self.assertEqual(child.to_primitive()['children'], [{'tag': 'Values', 'attrib': {}, 'children': [], 'text': '2'}])
+
+        lazy = LazyFirstUse(raw_value=parse('<LazyFirstUse><Values>2</Values></LazyFirstUse>'))
+        self.assertEqual(lazy.values, [2])
+        self.assertNotIn('def import_data', LazyFirstUse._schema.compiled_source)
+        self.assertEqual(LazyFirstUse(raw_value=parse('<LazyFirstUse />')).values, [])
+
+    def test_subclass_keeps_custom_methods(self):
+        for model in (CustomFirstUseChild, LazyCustomFirstUseChild):
+            for _ in range(2):
+                instance = model(raw_value=parse('<%s field1="1" />' % model.__name__))
+                self.assertEqual(instance.field1, 2)
+                self.assertEqual(instance.to_primitive()['text'], 'custom')
+            self.assertEqual(model(field1=1).to_xml(), '<%s field1="1">custom</%s>' % (model.__name__, model.__name__))
+
+    def test_creation_stats(self):
+        classes, seconds = class_creation_stats()['test_compiler']
+        self.assertGreaterEqual(classes, 8)
+        self.assertGreater(seconds, 0)
+
+        dynamic = type('Dynamic', (XmlElementModel,), {'field1': XmlAttribute(XmlIntType(), default=None)})
+        self.assertEqual(dynamic.__module__, __name__)
+        self.assertEqual(class_creation_stats()['test_compiler'][0], classes + 1)
+        self.assertNotIn(None, class_creation_stats())
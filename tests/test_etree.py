@@ -0,0 +1,68 @@
+import io
+import os
+import tempfile
+import unittest
+from xml.etree import ElementTree
+
+from xmltojson import parse
+
+from schematics_xmlelem.etree import ElementView
+from test_basic import Foo, Foo2, Foo3, Child1, Child2
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+FOO = (
+    '<Foo field1="23" field2="B">'
+    '   Some content'
+    '   <Bar>Hello!</Bar>'
+    '   <Baz>Item1</Baz>'
+    '   <Baz>Item2</Baz>'
+    '   <!-- comment -->'
+    '   <Check/>'
+    '   <BarNull1/>'
+    '</Foo>'
+)
+FOO2 = '<Foo2><Bars><Bar>Item1</Bar><Bar field1="2">Item2</Bar><Baz>Non-item</Baz></Bars></Foo2>'
+FOO3 = '<Foo3><Child1 /><Child2 field2="hi" /><Child1 field1="3" /></Foo3>'
+
+
+class ElementTestCase(unittest.TestCase):
+    def assertSameModel(self, model, expected):
+        self.assertEqual(model.to_primitive(), expected.to_primitive())
+
+    def test_from_xml(self):
+        self.assertSameModel(Foo.from_xml(FOO), Foo(raw_value=parse(FOO)))
+        self.assertSameModel(Foo2.from_xml(FOO2.encode()), Foo2(raw_value=parse(FOO2)))
+        self.assertSameModel(Foo3.from_xml(io.BytesIO(FOO3.encode())), Foo3(raw_value=parse(FOO3)))
+
+        foo = Foo.from_xml(FOO)
+        self.assertEqual(foo.content, 'Some content')
+        self.assertEqual(foo.bar_null1, 0)
+        self.assertEqual(foo.baz, ['Item1', 'Item2'])
+        self.assertEqual([type(child) for child in Foo3.from_xml(FOO3).children], [Child1, Child2, Child1])
+
+    def test_from_element(self):
+        element = ElementTree.fromstring(FOO2)
+        self.assertSameModel(Foo2.from_element(element), Foo2(raw_value=parse(FOO2)))
+        self.assertEqual(ElementView(element)['children'][0]['tag'], 'Bars')
+
+    def test_from_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'foo.xml')
+            with open(path, 'w') as fp:
+                fp.write(FOO)
+            for mmap in (True, False):
+                self.assertSameModel(Foo.from_file(path, mmap=mmap, chunk_size=7), Foo(raw_value=parse(FOO)))
+
+            empty = os.path.join(directory, 'empty.xml')
+            open(empty, 'w').close()
+            with self.assertRaises(ElementTree.ParseError):
+                Foo.from_file(empty)
+
+    @unittest.skipIf(lxml_etree is None, 'lxml is not installed')
+    def test_lxml(self):
+        self.assertSameModel(Foo.from_element(lxml_etree.fromstring(FOO)), Foo(raw_value=parse(FOO)))
+        self.assertSameModel(Foo3.from_element(lxml_etree.fromstring(FOO3)), Foo3(raw_value=parse(FOO3)))
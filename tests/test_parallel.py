@@ -0,0 +1,61 @@
+import copy
+import pathlib
+import pickle
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from schematics.exceptions import DataError, ConversionError
+from xmltojson import parse
+
+from schematics_xmlelem.parallel import decode_many, DecodeFailure
+from test_basic import Parent, Child1, Child2, Foo3, CompactBar, LazyFoo
+
+DOCUMENTS = ['<Child1 field1="1" />', b'<Child2 field2="two" />', '<Child1 field1="x" />', '<Other />', '<Parent']
+
+
+class ParallelTestCase(unittest.TestCase):
+    def check_results(self, results):
+        self.assertEqual(len(results), 5)
+        self.assertIsInstance(results[0], Child1)
+        self.assertEqual(results[0].field1, 1)
+        self.assertIsInstance(results[1], Child2)
+        self.assertEqual(results[1].field2, 'two')
+        self.assertIsInstance(results[2], DecodeFailure)
+        self.assertEqual(results[2].index, 2)
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertIsInstance(results[3].error, DataError)
+        self.assertIsInstance(results[4], DecodeFailure)
+
+    def test_process_pool(self):
+        with ProcessPoolExecutor(2) as executor:
+            self.check_results(decode_many(Parent, DOCUMENTS, executor, chunksize=2, allow_subclasses=True))
+
+    def test_thread_pool_and_paths(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = pathlib.Path(tmp) / 'doc.xml'
+            path.write_text('<Foo3><Child1 /><Child2 field2="a" /></Foo3>')
+            with ThreadPoolExecutor(2) as executor:
+                self.check_results(decode_many(Parent, DOCUMENTS, executor, allow_subclasses=True))
+                foo3, = decode_many(Foo3, [path], executor)
+        self.assertEqual([type(child) for child in foo3.children], [Child1, Child2])
+
+    def test_pickle(self):
+        foo3 = Foo3(children=[Child1(field1=1), Child2(field2='a')])
+        restored = pickle.loads(pickle.dumps(foo3))
+        self.assertEqual(restored.to_primitive(), foo3.to_primitive())
+        self.assertEqual(pickle.loads(pickle.dumps(CompactBar(content='x'))).content, 'x')
+
+        # Other instance state is kept, as with plain objects
+        foo3.source = 'file.xml'
+        self.assertEqual(pickle.loads(pickle.dumps(foo3)).source, 'file.xml')
+        self.assertEqual(copy.copy(foo3).source, 'file.xml')
+
+        lazy = LazyFoo(raw_value=parse('<LazyFoo><Bars><Bar>a</Bar></Bars></LazyFoo>'))
+        self.assertEqual([bar.content for bar in copy.deepcopy(lazy).bars], ['a'])
+        self.assertEqual([bar.content for bar in pickle.loads(pickle.dumps(lazy)).bars], ['a'])
+        self.assertEqual(type(lazy._data['bars']).__name__, 'LazyValue')
+
+        failure = pickle.loads(pickle.dumps(DecodeFailure(3, ConversionError('bad'))))
+        self.assertIsInstance(failure.error, ConversionError)
+        self.assertEqual(failure.index, 3)
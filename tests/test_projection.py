@@ -0,0 +1,63 @@
+import io
+import unittest
+from xml.etree import ElementTree
+
+from schematics.exceptions import DataError, UndefinedValueError
+from xmltojson import parse
+
+from schematics_xmlelem.attributes import XmlAttribute
+from schematics_xmlelem.children import XmlChild, XmlNestedChildList
+from schematics_xmlelem.model import XmlElementModel
+from schematics_xmlelem.streaming import iter_models
+from schematics_xmlelem.types import XmlIntType
+from test_basic import Foo, Bar, Foo3, Child1, Child2
+
+FOO = '<Foo field1="23" field2="B">c<Bar>b</Bar><Baz>1</Baz><Check/></Foo>'
+
+
+class Library(XmlElementModel):
+    id = XmlAttribute(XmlIntType())
+    latest = XmlChild(Bar, default=None)
+    bars = XmlNestedChildList(Bar)
+
+
+LIBRARY = '<Library id="1"><Bar field1="x">latest</Bar><Bars><Bar field1="2">a</Bar><Bar>b</Bar></Bars></Library>'
+
+
+class ProjectionTestCase(unittest.TestCase):
+    def test_fields(self):
+        foo = Foo.from_raw(parse(FOO), only={'field1', 'baz'})
+        self.assertEqual(foo.field1, 23)
+        self.assertEqual(foo.baz, ['1'])
+        with self.assertRaises(UndefinedValueError):
+            foo.content
+        self.assertEqual(Foo.from_raw(parse(FOO), only=['content']).content, 'c')
+
+        with self.assertRaises(ValueError):
+            Foo.projection({'missing'})
+        with self.assertRaises(ValueError):
+            Foo.projection({'bar': {'content'}})
+        with self.assertRaises(DataError):
+            Foo.from_raw(parse('<Foo><Rogue /></Foo>'), strict=True, only={'field1'})
+
+    def test_nested(self):
+        # The invalid latest/@field1 is never converted
+        library = Library.from_xml(LIBRARY, only={'id': None, 'latest': {'content'}, 'bars': {'field1'}})
+        self.assertEqual(library.latest.content, 'latest')
+        self.assertEqual([bar.field1 for bar in library.bars], [2, None])
+        with self.assertRaises(UndefinedValueError):
+            library.bars[0].content
+        with self.assertRaises(ValueError):
+            Library.projection({'bars': {'missing'}})
+
+        foo3 = Foo3.from_raw(ElementTree.fromstring('<Foo3><Child1 field1="3" /><Child2 field2="x" /></Foo3>'),
+                             only={'children': {'field1'}})
+        self.assertEqual([type(child) for child in foo3.children], [Child1, Child2])
+        self.assertEqual(foo3.children[0].field1, 3)
+        self.assertIs(Foo3.projection({'children': {'field1'}}), Foo3.projection({'children': ['field1']}))
+
+    def test_streaming(self):
+        document = b'<Bars><Bar field1="1">a</Bar><Bar field1="2">b</Bar></Bars>'
+        bars = list(iter_models(io.BytesIO(document), Bar, only={'field1'}))
+        self.assertEqual([bar.field1 for bar in bars], [1, 2])
+        self.assertNotIn('content', bars[0]._data)
@@ -0,0 +1,65 @@
+import unittest
+
+from schematics.exceptions import DataError
+from schematics.models import Model
+from schematics.types import ListType, DictType
+from xmltojson import parse
+
+from schematics_xmlelem.schematics import XmlModelType, XmlModelListType, XmlModelDictType
+from test_basic import Bar, Parent, Child1
+
+
+class Container(Model):
+    one = XmlModelType(Bar)
+    many = XmlModelListType(Bar)
+    named = XmlModelDictType(Parent)
+
+
+class PlainContainer(Model):
+    one = XmlModelType(Bar)
+    many = ListType(XmlModelType(Bar))
+    named = DictType(XmlModelType(Parent))
+
+
+class SchematicsTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        raw = {
+            'one': parse('<Bar>x</Bar>'),
+            'many': [parse('<Bar field1="1">a</Bar>'), None, parse('<Bar>b</Bar>')],
+            'named': {'first': parse('<Parent />')},
+        }
+        container = Container(raw)
+        self.assertEqual(container.one.content, 'x')
+        self.assertEqual([bar and bar.content for bar in container.many], ['a', None, 'b'])
+        self.assertIsInstance(container.named['first'], Parent)
+        container.validate()
+
+        primitive = container.to_primitive()
+        self.assertEqual(primitive['one'], raw['one'])
+        self.assertEqual(primitive['many'], raw['many'])
+        self.assertEqual(primitive['named'], raw['named'])
+        self.assertEqual(Container(primitive).to_primitive(), primitive)
+
+    def test_matches_plain_types(self):
+        raw = {
+            'one': parse('<Bar>x</Bar>'),
+            'many': [parse('<Bar field1="1">a</Bar>'), parse('<Bar>b</Bar>')],
+            'named': {'first': parse('<Parent />'), 'second': parse('<Parent />')},
+        }
+        self.assertEqual(Container(raw).to_primitive(), PlainContainer(raw).to_primitive())
+
+    def test_errors(self):
+        with self.assertRaises(DataError) as cm:
+            Container({'many': [parse('<Bar>a</Bar>'), parse('<Bar field1="x">b</Bar>')]})
+        self.assertEqual(list(cm.exception.errors['many']), [1])
+
+        with self.assertRaises(DataError) as cm:
+            Container({'named': {'a': parse('<Parent />'), 'b': parse('<Other />')}})
+        self.assertEqual(list(cm.exception.errors['named']), ['b'])
+
+    def test_from_raw_many(self):
+        child = Child1(field1=3)
+        models = Bar.from_raw_many([parse('<Bar>a</Bar>'), None])
+        self.assertEqual([type(model) for model in models], [Bar, type(None)])
+        self.assertIs(Child1.from_raw_many([child])[0], child)
+        self.assertEqual(Bar.from_raw_many([parse('<Bar>a</Bar>')])[0].field1, None)
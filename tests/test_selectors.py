@@ -0,0 +1,52 @@
+import unittest
+from xml.etree import ElementTree
+
+from xmltojson import parse
+
+from schematics_xmlelem.selectors import Selector
+from test_basic import Foo, Foo2, Foo4, Attribs, Bar, Child1
+
+FOO2 = '<Foo2><Bars><Bar field1="1">a</Bar><Bar>b</Bar><Bar field1="3">c</Bar></Bars></Foo2>'
+
+
+class SelectorTestCase(unittest.TestCase):
+    def test_select(self):
+        raw = parse(FOO2)
+        self.assertEqual(Foo2.selector('Foo2.bars[*].field1').select(raw), [1, 3])
+        self.assertEqual(Selector(Foo2, 'bars.content').select(ElementTree.fromstring(FOO2)), ['a', 'b', 'c'])
+        self.assertEqual(Foo2.selector('bars[-1].content').select(raw), ['c'])
+        self.assertEqual(Foo2.selector('bars[5].content').select(raw), [])
+        self.assertEqual([bar.content for bar in Foo2.selector('bars').select(raw)], ['a', 'b', 'c'])
+        self.assertIs(Foo2.selector('bars.field1'), Foo2.selector('bars.field1'))
+
+        self.assertEqual(Foo2.selector('bars.field1').select(parse('<Other />')), [])
+        self.assertEqual(Foo2.selector('bars.field1').first(parse('<Foo2 />'), 0), 0)
+
+    def test_typed_values_and_names(self):
+        raw = parse('<Foo field1="23" field2="B">c<Bar>b</Bar><Baz>x</Baz><Baz>y</Baz><Check/></Foo>')
+        self.assertEqual(Foo.selector('field1').select(raw), [23])
+        self.assertEqual(Foo.selector('baz[1]').select(raw), ['y'])
+        self.assertEqual(Foo.selector('check').select(raw), [True])
+        self.assertEqual(Foo.selector('content').select(raw), ['c'])
+
+        raw = parse('<Attribs FIRSTNAME="a" exact="b" EXACT="c" x-shadowed="d" />')
+        self.assertEqual(Attribs.selector('first_name').select(raw), ['a'])
+        self.assertEqual(Attribs.selector('exact').select(raw), ['c'])
+        self.assertEqual(Attribs.selector('x_shadowed').select(raw), [])
+
+        raw = parse('<Attribs FIRSTNAME="a" firstName="b" />')
+        self.assertEqual(Attribs.selector('first_name').select(raw), ['b'])
+        self.assertEqual(Attribs.selector('first_name').select(raw), [Attribs.from_raw(raw).first_name])
+
+    def test_polymorphic(self):
+        raw = parse('<Foo4><Items><Child1 field1="1" /><Child2 field2="x" /><Child1 /></Items></Foo4>')
+        self.assertEqual(Foo4.selector('items.field1').select(raw), [1])
+        self.assertEqual(Foo4.selector('items.field2').select(raw), ['x'])
+        self.assertIsInstance(Foo4.selector('items[0]').first(raw), Child1)
+
+    def test_invalid(self):
+        for path in ('', 'bars.missing', 'bars..field1', 'Foo2[0].bars', 'bars.field1.content'):
+            with self.assertRaises(ValueError):
+                Selector(Foo2, path)
+        with self.assertRaises(ValueError):
+            Selector(Bar, 'Bar')
@@ -0,0 +1,69 @@
+import io
+import unittest
+
+from xmltojson import parse
+
+from src.xmltojson.xmltojson import unparse
+
+from test_basic import Foo, Foo2, Foo3, Bar, Child2
+
+FOO = (
+    '<Foo field1="23" field2="B">'
+    '   Some &amp; content'
+    '   <Bar>Hello &lt;world&gt;</Bar>'
+    '   <Baz>Item1</Baz>'
+    '   <Baz>Item2</Baz>'
+    '   <Check/>'
+    '   <BarNull1/>'
+    '</Foo>'
+)
+FOO2 = '<Foo2><Bars><Bar>Item1</Bar><Bar field1="2">Item2</Bar><Bar>Item3</Bar></Bars></Foo2>'
+FOO3 = '<Foo3><Child1 /><Child2 field2="&quot;hi&quot; &amp; bye" /><Child1 field1="3" /><Parent /></Foo3>'
+
+
+class SerializerTestCase(unittest.TestCase):
+    def test_matches_unparse(self):
+        for model, document in ((Foo, FOO), (Foo2, FOO2), (Foo3, FOO3)):
+            instance = model(raw_value=parse(document))
+            self.assertEqual(instance.to_xml(), unparse(instance.to_primitive()))
+
+        self.assertEqual(Foo2(raw_value=parse(FOO2)).to_xml(), FOO2)
+        self.assertEqual(Foo3(raw_value=parse(FOO3)).to_xml(), FOO3)
+
+    def test_attribute_whitespace(self):
+        for value in ('a\nb\tc', 'a\r\nb', '"quoted"\t& <tagged>', '  padded  '):
+            child = Child2(field2=value)
+            document = child.to_xml()
+            self.assertEqual(document, unparse(child.to_primitive()))
+            self.assertEqual(Child2(raw_value=parse(document)).field2, value)
+
+        foo3 = Foo3(children=[Child2(field2='line1\nline2')])
+        self.assertEqual(foo3.to_xml(), unparse(foo3.to_primitive()))
+
+    def test_empty_text(self):
+        bar = Bar(content='')
+        self.assertEqual(bar.to_xml(), '<Bar />')
+        self.assertEqual(bar.to_xml(), unparse(bar.to_primitive()))
+
+        foo2 = Foo2(bars=[Bar(content=''), Bar(field1=1, content='')])
+        self.assertEqual(foo2.to_xml(), unparse(foo2.to_primitive()))
+
+    def test_write_xml_chunks(self):
+        foo2 = Foo2(bars=[Bar(field1=i, content='Item%d' % i) for i in range(100)])
+
+        chunks = []
+
+        class Sink(object):
+            def write(self, chunk):
+                chunks.append(chunk)
+
+        foo2.write_xml(Sink(), encoding='utf-8', chunk_size=64)
+
+        self.assertGreater(len(chunks), 10)
+        self.assertTrue(all(isinstance(chunk, bytes) for chunk in chunks))
+        self.assertEqual(b''.join(chunks), foo2.to_xml(encoding='utf-8'))
+        self.assertEqual(b''.join(chunks).decode('utf-8'), unparse(foo2.to_primitive()))
+
+        fp = io.StringIO()
+        foo2.write_xml(fp)
+        self.assertTrue(fp.getvalue().startswith('<Foo2><Bars><Bar field1="0">Item0</Bar>'))
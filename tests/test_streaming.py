@@ -0,0 +1,97 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from xml.etree import ElementTree
+
+from schematics.exceptions import DataError
+
+from schematics_xmlelem.streaming import iter_models, aiter_models, RecordDecoder
+from test_basic import Parent, Child1, Child2, Bar
+
+DOCUMENT = (
+    b'<Messages>'
+    b'<Header><Child1 field1="0" /></Header>'
+    b'<Child1 field1="1" />'
+    b'<Child2 field2="two" />'
+    b'<Unknown />'
+    b'<Parent />'
+    b'</Messages>'
+)
+
+
+class StreamingTestCase(unittest.TestCase):
+    def test_root_children(self):
+        models = list(iter_models(io.BytesIO(DOCUMENT), Parent, allow_subclasses=True))
+
+        self.assertEqual([type(model) for model in models], [Child1, Child2, Parent])
+        self.assertEqual(models[0].field1, 1)
+        self.assertEqual(models[1].field2, 'two')
+
+    def test_path(self):
+        models = list(iter_models(io.BytesIO(DOCUMENT), [Child1, Child2], path='Messages/*'))
+        self.assertEqual([type(model) for model in models], [Child1, Child2])
+
+        models = list(iter_models(io.BytesIO(DOCUMENT), Child1, path='/*/Header/Child1'))
+        self.assertEqual([model.field1 for model in models], [0])
+
+        document = b'<Rows><Page><Bar>a</Bar><Bar field1="2">b</Bar></Page><Page><Bar>c</Bar></Page></Rows>'
+        models = list(iter_models(io.BytesIO(document), Bar, path=['Rows', 'Page', 'Bar']))
+        self.assertEqual([model.content for model in models], ['a', 'b', 'c'])
+
+    def test_mmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'messages.xml')
+            with open(path, 'wb') as fp:
+                fp.write(DOCUMENT)
+            for mmap in (True, False):
+                models = list(iter_models(path, Parent, allow_subclasses=True, mmap=mmap, chunk_size=5))
+                self.assertEqual([type(model) for model in models], [Child1, Child2, Parent])
+
+    def test_strict(self):
+        with self.assertRaises(DataError):
+            list(iter_models(io.BytesIO(DOCUMENT), Parent, allow_subclasses=True, strict=True))
+
+    def test_elements_released(self):
+        decoder = RecordDecoder(Bar)
+        parser = ElementTree.XMLPullParser(events=('start', 'end'))
+        parser.feed(b'<Rows>')
+        root = None
+        for i in range(10):
+            parser.feed(b'<Bar>x</Bar>')
+            for event, element in parser.read_events():
+                root = element if root is None else root
+                decoder.feed(event, element)
+            self.assertEqual(len(root), 0)
+
+
+class AsyncStreamingTestCase(unittest.TestCase):
+    async def collect(self, data, **kwargs):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return [model async for model in aiter_models(reader, **kwargs)]
+
+    def test_aiter_models(self):
+        models = asyncio.run(self.collect(DOCUMENT, model=Parent, allow_subclasses=True, chunk_size=7))
+        self.assertEqual([type(model) for model in models], [Child1, Child2, Parent])
+        self.assertEqual(models[1].field2, 'two')
+
+    def test_time_budget(self):
+        turns = []
+
+        async def ticker():
+            while True:
+                turns.append(None)
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.ensure_future(ticker())
+            document = b'<Rows>' + b'<Bar field1="1">x</Bar>' * 200 + b'</Rows>'
+            models = await self.collect(document, model=Bar, time_budget=0)
+            task.cancel()
+            return models
+
+        self.assertEqual(len(asyncio.run(main())), 200)
+        self.assertGreater(len(turns), 100)
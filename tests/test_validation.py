@@ -0,0 +1,77 @@
+import unittest
+
+from schematics.exceptions import DataError, ValidationError
+from xmltojson import parse
+
+from schematics_xmlelem.attributes import XmlAttribute
+from schematics_xmlelem.children import XmlChildren
+from schematics_xmlelem.model import XmlElementModel
+from schematics_xmlelem.types import XmlIntType
+from schematics_xmlelem.validation import validate_many
+
+
+class Sized(XmlElementModel):
+    size = XmlAttribute(XmlIntType(), default=None)
+
+    def validate_size(self, data, value):
+        if value is not None and value < 0:
+            raise ValidationError('Negative size')
+
+
+class AutoSized(Sized):
+    auto_validate = True
+
+
+class CompiledAutoSized(Sized):
+    auto_validate = True
+    compiled = True
+
+
+class Box(XmlElementModel):
+    lazy = True
+
+    items = XmlChildren(Sized)
+
+    @classmethod
+    def validate_items(cls, data, value, context):
+        if len(value) > 2:
+            raise ValidationError('Too many items')
+
+
+class ValidationTestCase(unittest.TestCase):
+    def test_validate(self):
+        self.assertEqual(Sized(size=1).validate().size, 1)
+        with self.assertRaises(DataError) as cm:
+            Sized(size=-1).validate()
+        self.assertEqual(list(cm.exception.errors), ['size'])
+
+        box = Box(raw_value=parse('<Box><Sized size="1" /><Sized size="-1" /></Box>'))
+        with self.assertRaises(DataError) as cm:
+            box.validate()
+        self.assertEqual(list(cm.exception.errors['items']), [1])
+
+    def test_auto_validate(self):
+        for model in (AutoSized, CompiledAutoSized):
+            tag = model.__name__
+            self.assertEqual(model(raw_value=parse('<%s size="2" />' % tag)).size, 2)
+            with self.assertRaises(DataError):
+                model(raw_value=parse('<%s size="-2" />' % tag))
+        # Only validated on import
+        self.assertEqual(AutoSized(size=-1).size, -1)
+
+    def test_validate_many(self):
+        models = [
+            Sized(size=1),
+            Sized(size=-1),
+            Box(items=[Sized(size=1), Sized(size=-2)]),
+            Box(items=[Sized(size=-3)] * 3),
+            Box(raw_value=parse('<Box><Sized size="x" /></Box>')),
+        ]
+        errors = validate_many(models)
+        self.assertEqual(sorted(errors), [1, 2, 3, 4])
+        self.assertEqual(list(errors[1]), ['size'])
+        self.assertEqual(list(errors[2]['items']), [1])
+        # A failing validator on a field takes precedence over errors in its nested models
+        self.assertNotIsInstance(errors[3]['items'], dict)
+        self.assertIn('items', errors[4])
+        self.assertEqual(validate_many([]), {})